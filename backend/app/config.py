@@ -1,13 +1,12 @@
 """Application configuration."""
 
 from pydantic_settings import BaseSettings
+from functools import lru_cache
 from pathlib import Path
-import os
-
-# Load .env file explicitly
+from typing import Literal, Optional
 from dotenv import load_dotenv
+
 env_file = Path(__file__).parent.parent / ".env"
-load_dotenv(env_file)
 
 
 class Settings(BaseSettings):
@@ -17,14 +16,29 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    bcrypt_rounds: int = 10  # log2 of the hashing work; existing hashes keep their own cost
     environment: str = "development"
     openai_api_key: str
+    openai_max_concurrency: int = 20  # OpenAI calls in flight per worker
+    redis_url: Optional[str] = None
+    db_pool_class: Literal["queue", "null"] = "queue"  # "null" for serverless databases
+    db_pool_size: int = 10
+    db_max_overflow: int = 5
+    db_pool_recycle: int = 60
+    db_pgbouncer: bool = False
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get settings instance."""
+    """Get settings instance.
+    
+    Settings are loaded once per process; call ``get_settings.cache_clear()``
+    to reload them (e.g. after changing environment variables in tests).
+    """
+    # Load .env file explicitly
+    load_dotenv(env_file)
     return Settings()
@@ -1,5 +1,6 @@
 """Database configuration and session management."""
 
+import logging
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
@@ -7,12 +8,34 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Log SQL through the logging level instead of echo=True, so statements and
+# parameters are only formatted when the logger is enabled (development)
+sql_logger = logging.getLogger("sqlalchemy.engine")
+if settings.environment == "development":
+    sql_logger.setLevel(logging.INFO)
+    if not sql_logger.handlers:
+        sql_logger.addHandler(logging.StreamHandler())
+else:
+    sql_logger.setLevel(logging.WARNING)
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=NullPool,  # Use NullPool for serverless databases
-    echo=settings.environment == "development",
-)
+if settings.db_pool_class == "null":
+    # Serverless databases manage their own pooling
+    engine = create_engine(
+        settings.database_url,
+        poolclass=NullPool,
+    )
+else:
+    # Reuse warm connections (LIFO lets idle ones age out); skip the pre-ping
+    # when PgBouncer is in front since it already validates server connections
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=not settings.db_pgbouncer,
+        pool_use_lifo=True,
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -3,32 +3,126 @@
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from starlette.types import Receive, Scope, Send
+from collections import deque
+from typing import Deque, Dict, Optional
+from uuid import uuid4
 import asyncio
+import logging
+import re
+import time
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# The only rate limited routes: POST /api/{user_id}/chat and its streaming variant
+CHAT_PATH_RE = re.compile(r"^/api/([^/]+)/chat(?:/stream)?$")
+
+
+# Atomic sliding-window check shared by all workers:
+# KEYS[1] = per-user key, ARGV[1] = now (ms), ARGV[2] = limit, ARGV[3] = unique member
+SLIDING_WINDOW_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - 60000)
+local n = redis.call('ZCARD', KEYS[1])
+if n >= tonumber(ARGV[2]) then
+    return 1
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], 60)
+return 0
+"""
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Rate limiting middleware to prevent abuse.
     
-    Applies rate limiting to chat endpoint (10 requests per minute per user).
-    Returns 429 Too Many Requests when limit exceeded.
+    Applies rate limiting to chat endpoint (10 requests per minute per user)
+    and caps how many chat requests a user can have in flight at once.
+    Returns 429 Too Many Requests when either limit is exceeded.
+    
+    When a Redis URL is configured the limit is enforced in Redis, so it holds
+    across all worker processes; otherwise request history is kept in-process.
     
     **Validates: Requirements 10.1, 10.2**
     """
     
-    def __init__(self, app, requests_per_minute: int = 10):
+    # Length of the rate limit window, in seconds of the monotonic clock
+    window_seconds = 60.0
+    
+    # Seconds between sweeps of idle users from the in-process history
+    sweep_interval = 60.0
+    
+    def __init__(
+        self,
+        app,
+        requests_per_minute: int = 10,
+        redis_url: Optional[str] = None,
+        max_concurrent_per_user: int = 3,
+    ):
         """Initialize rate limiting middleware.
         
         Args:
             app: FastAPI application
             requests_per_minute: Maximum requests per minute per user (default: 10)
+            redis_url: Redis connection URL for a shared limiter (optional)
+            max_concurrent_per_user: Maximum chat requests per user in flight at
+                once in this process (default: 3)
         """
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        # Store request history: {user_id: [(timestamp, request_count), ...]}
-        self.request_history: Dict[str, list] = {}
-        self.lock = asyncio.Lock()
+        self.max_concurrent_per_user = max_concurrent_per_user
+        self.redis = None
+        self.sliding_window = None
+        if redis_url:
+            self.redis = redis.from_url(redis_url)
+            self.sliding_window = self.redis.register_script(SLIDING_WINDOW_SCRIPT)
+        # Set while Redis is failing so the outage is logged once, not per request
+        self._redis_unavailable = False
+        # Store request history: {user_id: deque of monotonic timestamps}
+        self.request_history: Dict[str, Deque[float]] = {}
+        # Chat requests currently being handled: {user_id: count}; users are
+        # removed when their last request finishes
+        self.inflight: Dict[str, int] = {}
+        # Background task that drops idle users; runs between application
+        # startup and shutdown
+        self._sweeper: Optional[asyncio.Task] = None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Hook application startup/shutdown for background work; pass everything else on."""
+        if scope["type"] != "lifespan":
+            await super().__call__(scope, receive, send)
+            return
+        
+        async def lifespan_receive():
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+            elif message["type"] == "lifespan.shutdown":
+                await self.close()
+            return message
+        
+        await self.app(scope, lifespan_receive, send)
+    
+    def start(self) -> None:
+        """Start sweeping idle users from the in-process history.
+        
+        Not needed when Redis holds the history; the local fallback only
+        fills up during a Redis outage.
+        """
+        if self.redis is None and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+    
+    async def close(self) -> None:
+        """Stop the sweeper and close the Redis connection pool, if one was opened."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        if self.redis is not None:
+            await self.redis.aclose()
     
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process request and apply rate limiting.
@@ -42,32 +136,85 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             
         **Validates: Requirements 10.1, 10.2**
         """
-        # Only apply rate limiting to chat endpoint
-        if not request.url.path.endswith("/chat"):
-            return await call_next(request)
-        
-        # Extract user_id from path
-        path_parts = request.url.path.split("/")
-        if len(path_parts) < 3:
+        # Only apply rate limiting to chat endpoint; everything else passes
+        # straight through after one compiled match
+        match = CHAT_PATH_RE.match(request.scope["path"])
+        if match is None:
             return await call_next(request)
         
-        user_id = path_parts[2]
+        user_id = match.group(1)
         
-        # Check rate limit
-        async with self.lock:
-            is_limited = self._check_rate_limit(user_id)
-        
-        if is_limited:
-            # Return 429 Too Many Requests
+        # Bound concurrent chat calls before spending any of the per-minute budget
+        if self.inflight.get(user_id, 0) >= self.max_concurrent_per_user:
             return Response(
-                content="Too many requests. Please try again later.",
+                content="Too many concurrent requests. Please try again later.",
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                headers={"Retry-After": "60"},
+                headers={"Retry-After": "1"},
             )
         
-        # Process request
-        response = await call_next(request)
-        return response
+        # Reserve the slot before awaiting anything so concurrent requests see it
+        self.inflight[user_id] = self.inflight.get(user_id, 0) + 1
+        release_now = True
+        try:
+            # Check rate limit
+            if self.redis is not None:
+                is_limited = await self._check_rate_limit_redis(user_id)
+            else:
+                # _check_rate_limit never awaits, so it runs atomically on the event loop
+                is_limited = self._check_rate_limit(user_id)
+            
+            if is_limited:
+                # Return 429 Too Many Requests
+                return Response(
+                    content="Too many requests. Please try again later.",
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": "60"},
+                )
+            
+            # Process request
+            response = await call_next(request)
+            
+            # call_next returns before the body is produced, so a streamed
+            # reply (chat/stream) keeps its slot until the body is finished
+            body_iterator = getattr(response, "body_iterator", None)
+            if body_iterator is not None:
+                response.body_iterator = self._release_after_body(body_iterator, user_id)
+                release_now = False
+            return response
+        finally:
+            if release_now:
+                self._release_inflight(user_id)
+    
+    async def _release_after_body(self, body_iterator, user_id: str):
+        """Pass a response body through, releasing the user's slot once it ends.
+        
+        The slot is released when the body is exhausted, fails, or is closed
+        early because the client went away.
+        
+        Args:
+            body_iterator: The response's async body iterator
+            user_id: The user ID holding the in-flight slot
+            
+        Yields:
+            The body chunks, unchanged
+        """
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            self._release_inflight(user_id)
+    
+    def _release_inflight(self, user_id: str) -> None:
+        """Release one in-flight slot for a user.
+        
+        Args:
+            user_id: The user ID whose request finished
+        """
+        remaining = self.inflight.get(user_id, 0) - 1
+        if remaining > 0:
+            self.inflight[user_id] = remaining
+        else:
+            self.inflight.pop(user_id, None)
     
     def _check_rate_limit(self, user_id: str) -> bool:
         """Check if user has exceeded rate limit.
@@ -80,23 +227,72 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             
         **Validates: Requirements 10.1, 10.2**
         """
-        now = datetime.utcnow()
-        one_minute_ago = now - timedelta(minutes=1)
+        now = time.monotonic()
+        cutoff = now - self.window_seconds
         
         # Initialize user history if not exists
-        if user_id not in self.request_history:
-            self.request_history[user_id] = []
+        history = self.request_history.setdefault(user_id, deque())
         
-        # Remove old requests (older than 1 minute)
-        self.request_history[user_id] = [
-            timestamp for timestamp in self.request_history[user_id]
-            if timestamp > one_minute_ago
-        ]
+        # Remove old requests (older than 1 minute); timestamps are appended
+        # in order, so expired entries are always at the left end
+        while history and history[0] <= cutoff:
+            history.popleft()
         
         # Check if user has exceeded limit
-        if len(self.request_history[user_id]) >= self.requests_per_minute:
+        if len(history) >= self.requests_per_minute:
             return True
         
         # Add current request
-        self.request_history[user_id].append(now)
+        history.append(now)
         return False
+
+    def _sweep_request_history(self) -> int:
+        """Remove users with no requests inside the current window.
+        
+        Returns:
+            int: Number of users removed from the history
+        """
+        cutoff = time.monotonic() - self.window_seconds
+        idle_users = [
+            user_id for user_id, history in self.request_history.items()
+            if not history or history[-1] <= cutoff
+        ]
+        for user_id in idle_users:
+            self.request_history.pop(user_id, None)
+        return len(idle_users)
+    
+    async def _sweep_loop(self) -> None:
+        """Periodically sweep idle users so request history stays bounded."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self._sweep_request_history()
+    
+    async def _check_rate_limit_redis(self, user_id: str) -> bool:
+        """Check if user has exceeded rate limit using the shared Redis window.
+        
+        Falls back to the in-process check if Redis is unavailable.
+        
+        Args:
+            user_id: The user ID to check
+            
+        Returns:
+            bool: True if rate limited, False otherwise
+            
+        **Validates: Requirements 10.1, 10.2**
+        """
+        now_ms = int(time.time() * 1000)
+        try:
+            result = await self.sliding_window(
+                keys=[f"rl:{user_id}"],
+                args=[now_ms, self.requests_per_minute, uuid4().hex],
+            )
+        except (redis.RedisError, OSError) as e:
+            if not self._redis_unavailable:
+                self._redis_unavailable = True
+                logger.warning("Redis rate limiter unavailable, using local limiter: %s", e)
+            return self._check_rate_limit(user_id)
+        
+        if self._redis_unavailable:
+            self._redis_unavailable = False
+            logger.info("Redis rate limiter recovered")
+        return bool(result)
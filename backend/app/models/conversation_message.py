@@ -1,6 +1,6 @@
 """Conversation message model for chat history."""
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -12,12 +12,17 @@ class ConversationMessage(Base):
     """Conversation message model for storing chat history."""
 
     __tablename__ = "conversation_messages"
+    __table_args__ = (
+        # Serves per-user history ordered by time, including the
+        # (created_at, id) keyset seek used for pagination
+        Index("ix_conversation_messages_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     sender = Column(String(20), nullable=False)  # 'user' or 'assistant'
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="messages")
@@ -1,6 +1,6 @@
 """Task model."""
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -12,13 +12,18 @@ class Task(Base):
     """Task model for todo items."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Serves per-user task lists ordered by (created_at, id) without a sort
+        Index("ix_tasks_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Looked up through ix_tasks_user_created_id, whose leading column it is
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     description = Column(Text, nullable=False)
     completed = Column(Boolean, default=False, nullable=False)
     priority = Column(String(20), default="Medium", nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
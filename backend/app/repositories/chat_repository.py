@@ -1,10 +1,11 @@
 """Chat repository for managing conversation message persistence."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, or_, select, tuple_
+from sqlalchemy.orm import Session, aliased
 from app.models import ConversationMessage
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 
 class ChatRepository:
@@ -45,6 +46,37 @@ class ChatRepository:
         self.db.refresh(message)
         return message
 
+    def add_messages(self, records: List[Tuple[UUID, str, str, datetime]]) -> List[ConversationMessage]:
+        """Persist several messages in a single transaction.
+        
+        IDs and timestamps are generated client-side, so the messages are
+        detached after the flush and returned without re-selecting them.
+        
+        Args:
+            records: (user_id, content, sender, created_at) tuples
+            
+        Returns:
+            List[ConversationMessage]: The persisted (detached) messages, in order
+            
+        Raises:
+            ValueError: If any sender is not 'user' or 'assistant'
+        """
+        for _, _, sender, _ in records:
+            if sender not in ["user", "assistant"]:
+                raise ValueError(f"Invalid sender: {sender}. Must be 'user' or 'assistant'")
+        
+        messages = [
+            ConversationMessage(user_id=user_id, content=content, sender=sender, created_at=created_at)
+            for user_id, content, sender, created_at in records
+        ]
+        self.db.add_all(messages)
+        self.db.flush()
+        # Detach before commit so the commit doesn't expire them
+        for message in messages:
+            self.db.expunge(message)
+        self.db.commit()
+        return messages
+
     def get_messages(self, user_id: UUID, limit: int = 50, offset: int = 0) -> List[ConversationMessage]:
         """Retrieve messages for a user in chronological order.
         
@@ -59,7 +91,8 @@ class ChatRepository:
         query = self.db.query(ConversationMessage).filter(
             ConversationMessage.user_id == user_id
         ).order_by(
-            ConversationMessage.created_at.asc()
+            ConversationMessage.created_at.asc(),
+            ConversationMessage.id.asc(),
         ).offset(offset)
         
         if limit is not None:
@@ -67,6 +100,76 @@ class ChatRepository:
         
         return query.all()
 
+    def get_messages_page(
+        self,
+        user_id: UUID,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> Tuple[List[Row], int]:
+        """Retrieve a page of messages together with a count, in one query.
+        
+        Messages are ordered by ``(created_at, id)``. Pass ``after`` (the
+        ``(created_at, id)`` of the last message already seen) to page with a
+        keyset seek, which stays O(limit) regardless of history depth.
+        
+        The count comes from a ``count(*) OVER ()`` window over the same scan
+        that produces the page. When paging by offset it is the user's total;
+        when paging with ``after`` it is the number of messages after the cursor.
+        
+        Only the columns the history view needs are selected, as plain rows,
+        so no ORM objects are built or tracked in the session.
+        
+        Args:
+            user_id: ID of the user
+            limit: Maximum number of messages to retrieve (default 50)
+            offset: Number of messages to skip (default 0); ignored with ``after``
+            after: ``(created_at, id)`` of the last message already seen (optional)
+            
+        Returns:
+            Tuple[List[Row], int]: Rows with ``id``, ``content``, ``sender`` and
+            ``created_at`` in chronological order, and the count
+        """
+        order = (ConversationMessage.created_at.asc(), ConversationMessage.id.asc())
+        columns = (
+            ConversationMessage.id,
+            ConversationMessage.content,
+            ConversationMessage.sender,
+            ConversationMessage.created_at,
+        )
+        
+        if after is not None:
+            rows = self.db.execute(
+                select(*columns, func.count().over().label("total"))
+                .where(
+                    ConversationMessage.user_id == user_id,
+                    tuple_(ConversationMessage.created_at, ConversationMessage.id) > tuple_(*after),
+                )
+                .order_by(*order)
+                .limit(limit)
+            ).all()
+            return rows, rows[0].total if rows else 0
+        
+        numbered = select(
+            *columns,
+            func.count().over().label("total"),
+            func.row_number().over(order_by=order).label("position"),
+        ).where(ConversationMessage.user_id == user_id).subquery()
+        
+        # The last row is always kept so a page past the end still carries the total
+        rows = self.db.execute(
+            select(numbered)
+            .where(or_(
+                numbered.c.position > offset,
+                numbered.c.position == numbered.c.total,
+            ))
+            .order_by(numbered.c.position)
+            .limit(limit)
+        ).all()
+        
+        messages = [row for row in rows if row.position > offset]
+        return messages, rows[0].total if rows else 0
+
     def get_recent_messages(self, user_id: UUID, count: int = 10) -> List[ConversationMessage]:
         """Retrieve the most recent N messages for a user.
         
@@ -79,11 +182,17 @@ class ChatRepository:
         Returns:
             List[ConversationMessage]: Most recent messages in chronological order
         """
-        return self.db.query(ConversationMessage).filter(
+        # Take the newest N via a backwards index scan, then re-sort them in SQL
+        recent = self.db.query(ConversationMessage).filter(
             ConversationMessage.user_id == user_id
         ).order_by(
             ConversationMessage.created_at.desc()
-        ).limit(count).all()[::-1]  # Reverse to get chronological order
+        ).limit(count).subquery()
+        recent_message = aliased(ConversationMessage, recent)
+        
+        return self.db.query(recent_message).order_by(
+            recent_message.created_at.asc()
+        ).all()
 
     def delete_messages(self, user_id: UUID) -> int:
         """Delete all messages for a user.
@@ -1,10 +1,12 @@
 """Authentication routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas import SignupRequest, SigninRequest, AuthResponse
 from app.services import AuthenticationService
+from app.services.auth import invalidate_token
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -25,7 +27,8 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     """
     try:
         auth_service = AuthenticationService(db)
-        return auth_service.signup(request)
+        # Password hashing is CPU-bound, so keep it off the event loop
+        return await run_in_threadpool(auth_service.signup, request)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,7 +57,8 @@ async def signin(request: SigninRequest, db: Session = Depends(get_db)):
     """
     try:
         auth_service = AuthenticationService(db)
-        return auth_service.signin(request)
+        # Password checking is CPU-bound, so keep it off the event loop
+        return await run_in_threadpool(auth_service.signin, request)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,12 +67,17 @@ async def signin(request: SigninRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout():
+async def logout(authorization: str = Header(None)):
     """Sign out a user.
     
+    Args:
+        authorization: Authorization header with Bearer token (optional)
+        
     Returns:
         Success message
     """
+    if authorization and authorization.startswith("Bearer "):
+        invalidate_token(authorization[7:])
     return {"message": "Successfully logged out"}
 
 
@@ -97,7 +106,9 @@ async def get_current_user(token: str = None, db: Session = Depends(get_db)):
         user_id = auth_service.validate_token(token)
         
         from app.models import User
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.id == user_id).first()
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
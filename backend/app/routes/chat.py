@@ -1,16 +1,22 @@
 """Chat routes for conversational task management."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.repositories import ChatRepository
+from app.services.auth import get_token_validator
 from app.services.chat import ChatService
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from uuid import UUID
-import jwt
-from app.config import get_settings
+from datetime import datetime
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
@@ -40,7 +46,35 @@ class ChatEndpointResponse(BaseModel):
 class ChatHistoryResponse(BaseModel):
     """Response model for chat history endpoint."""
     messages: list[ChatMessageResponse]
-    total_count: int
+    total_count: int = Field(
+        ...,
+        description="All messages when paging by offset; messages after the cursor when paging with `after`",
+    )
+    next_after: Optional[str] = Field(
+        None,
+        description="Cursor for the next page, or null when there are no more messages",
+    )
+
+
+def _encode_history_cursor(created_at: datetime, message_id: UUID) -> str:
+    """Build the opaque ``after`` cursor that points at a message."""
+    return f"{created_at.isoformat()},{message_id}"
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Parse an ``after`` cursor back into ``(created_at, id)``.
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, message_id = cursor.split(",")
+        return datetime.fromisoformat(created_at), UUID(message_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid history cursor",
+        )
 
 
 def get_current_user_from_token(authorization: str = Header(None, alias="Authorization"), db: Session = Depends(get_db)) -> User:
@@ -63,51 +97,40 @@ def get_current_user_from_token(authorization: str = Header(None, alias="Authori
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Remove "Bearer " prefix if present
+    if authorization.startswith("Bearer "):
+        token = authorization[7:]
+    else:
+        token = authorization
+    
     try:
-        # Remove "Bearer " prefix if present
-        if authorization.startswith("Bearer "):
-            token = authorization[7:]
-        else:
-            token = authorization
-        
-        settings = get_settings()
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        token_user_id = payload.get("user_id")
-        
-        if not token_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Verify user exists
-        user = db.query(User).filter(User.id == UUID(token_user_id)).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
-            )
-        
-        return user
-        
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except jwt.InvalidTokenError:
+        # Shares the verification cache with the task routes, so logging out
+        # drops the token for both
+        token_user_id = get_token_validator().validate(token)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
+            detail="Token has expired" if str(e) == "Token has expired" else "Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    try:
+        user_id = UUID(token_user_id)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid user ID format",
         )
+    
+    # Verify user exists (primary-key lookup checks the identity map first)
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    return user
 
 
 @router.post("/{user_id}/chat", response_model=ChatEndpointResponse, status_code=status.HTTP_200_OK)
@@ -150,7 +173,7 @@ async def chat(
     try:
         # Create chat service and process message
         chat_service = ChatService(db)
-        result = chat_service.process_message(current_user.id, request.message.strip())
+        result = await chat_service.process_message(current_user.id, request.message.strip())
         
         return ChatEndpointResponse(
             user_message_id=result["user_message"]["id"],
@@ -162,19 +185,15 @@ async def chat(
         
     except ValueError as e:
         # Handle validation errors (e.g., empty message)
-        import traceback
-        print(f"Validation error in chat endpoint: {str(e)}")
-        print(traceback.format_exc())
+        logger.warning("Validation error in chat endpoint: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     except Exception as e:
         # Log the error for debugging
-        import traceback
         error_msg = str(e)
-        print(f"Error in chat endpoint: {error_msg}")
-        print(traceback.format_exc())
+        logger.exception("Error in chat endpoint")
         
         # Handle unexpected errors
         raise HTTPException(
@@ -183,28 +202,107 @@ async def chat(
         )
 
 
-@router.get("/{user_id}/chat/history", response_model=ChatHistoryResponse, status_code=status.HTTP_200_OK)
+async def _sse_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode chat events as Server-Sent Events ``data:`` lines."""
+    try:
+        async for event in events:
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+    except Exception:
+        # Headers are already sent, so report the failure in-band
+        logger.exception("Error in chat stream")
+        yield b"data: " + orjson.dumps({
+            "type": "error",
+            "detail": "An error occurred while processing your message",
+        }) + b"\n\n"
+
+
+@router.post(
+    "/{user_id}/chat/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def chat_stream(
+    user_id: str,
+    request: ChatMessageRequest,
+    current_user: User = Depends(get_current_user_from_token),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Process a chat message, streaming the response as Server-Sent Events.
+    
+    Each event is a ``data:`` line holding a JSON object: ``{"type": "token",
+    "content": ...}`` as response text is generated, then one ``{"type":
+    "done", "user_message": {...}, "assistant_message": {...}}`` with the
+    stored messages (the assistant message may add tool errors or an
+    operations summary to the streamed text). A failure after streaming has
+    started is sent as ``{"type": "error", "detail": ...}``.
+    
+    Args:
+        user_id: ID of the user sending the message
+        request: Chat message request with message content
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        StreamingResponse: ``text/event-stream`` of chat events
+        
+    Raises:
+        HTTPException: If validation fails or user is not authenticated
+        
+    **Validates: Requirements 1.1, 1.2, 1.3, 1.4, 5.1, 5.2, 5.3, 5.5, 6.1, 6.2, 9.1, 9.2, 9.3**
+    """
+    if str(current_user.id) != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User ID mismatch",
+        )
+    
+    if not request.message or not request.message.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Message cannot be empty",
+        )
+    
+    chat_service = ChatService(db)
+    return StreamingResponse(
+        _sse_events(chat_service.stream_message(current_user.id, request.message.strip())),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get(
+    "/{user_id}/chat/history",
+    response_model=ChatHistoryResponse,
+    response_class=ORJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
 async def get_chat_history(
     user_id: str,
     limit: int = 50,
     offset: int = 0,
+    after: Optional[str] = None,
     current_user: User = Depends(get_current_user_from_token),
     db: Session = Depends(get_db),
-) -> ChatHistoryResponse:
+) -> ORJSONResponse:
     """Retrieve conversation history for a user with pagination.
     
+    Clients paging through long histories should pass the ``next_after``
+    cursor from the previous page as ``after`` instead of a growing ``offset``.
+    
     Args:
         user_id: ID of the user
         limit: Maximum number of messages to retrieve (default 50)
         offset: Number of messages to skip (default 0)
+        after: Cursor from a previous page's ``next_after`` (optional)
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        ChatHistoryResponse: List of messages and total count
+        ORJSONResponse: Body shaped like ChatHistoryResponse (messages, count
+        and next-page cursor), serialized directly without pydantic models
         
     Raises:
-        HTTPException: If user is not authenticated or user_id mismatch
+        HTTPException: If user is not authenticated, user_id mismatch, or the cursor is invalid
         
     **Validates: Requirements 4.2, 6.5, 8.3**
     """
@@ -215,49 +313,60 @@ async def get_chat_history(
             detail="User ID mismatch",
         )
     
+    if after is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either offset or after, not both",
+        )
+    cursor = _decode_history_cursor(after) if after is not None else None
+    
     try:
         # Try to get messages, but handle case where table doesn't exist yet
         try:
-            from app.models import ConversationMessage
-            messages = db.query(ConversationMessage).filter(
-                ConversationMessage.user_id == current_user.id
-            ).order_by(
-                ConversationMessage.created_at.asc()
-            ).offset(offset).limit(limit).all()
-            
-            total_count = db.query(ConversationMessage).filter(
-                ConversationMessage.user_id == current_user.id
-            ).count()
+            messages, total_count = await run_in_threadpool(
+                ChatRepository(db).get_messages_page,
+                current_user.id,
+                limit=limit,
+                offset=offset,
+                after=cursor,
+            )
         except Exception as table_error:
             # Table might not exist yet, return empty history
-            print(f"Warning: Could not query conversation_messages table: {str(table_error)}")
+            logger.warning("Could not query conversation_messages table: %s", table_error)
             messages = []
             total_count = 0
         
-        # Convert messages to response format
-        message_responses = [
-            ChatMessageResponse(
-                id=str(msg.id),
-                content=msg.content,
-                sender=msg.sender,
-                timestamp=msg.created_at.isoformat(),
-            )
+        # Plain dicts: the rows go straight to orjson instead of through pydantic
+        message_rows = [
+            {
+                "id": str(msg.id),
+                "content": msg.content,
+                "sender": msg.sender,
+                "timestamp": msg.created_at.isoformat(),
+            }
             for msg in messages
         ]
         
-        return ChatHistoryResponse(
-            messages=message_responses,
-            total_count=total_count,
-        )
+        # More messages remain if this page didn't reach the end of the count
+        seen = len(messages) if cursor is not None else offset + len(messages)
+        next_after = None
+        if messages and seen < total_count:
+            last = messages[-1]
+            next_after = _encode_history_cursor(last.created_at, last.id)
         
-    except Exception as e:
+        return ORJSONResponse({
+            "messages": message_rows,
+            "total_count": total_count,
+            "next_after": next_after,
+        })
+        
+    except Exception:
         # Log the error for debugging
-        import traceback
-        print(f"Error in get_chat_history: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in get_chat_history")
         
         # Return empty history instead of 500 error
-        return ChatHistoryResponse(
-            messages=[],
-            total_count=0,
-        )
+        return ORJSONResponse({
+            "messages": [],
+            "total_count": 0,
+            "next_after": None,
+        })
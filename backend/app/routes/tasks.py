@@ -1,19 +1,24 @@
 """Task routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
 from app.schemas import TaskCreate, TaskUpdate, TaskResponse
-from app.services import AuthenticationService, TaskService
+from app.services import TaskService
+from app.services.auth import get_token_validator
 from app.models import User
 
 router = APIRouter(prefix="/api", tags=["tasks"])
 
 
-def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)) -> User:
+async def get_current_user(authorization: str = Header(None), db: Session = Depends(get_db)) -> User:
     """Get current authenticated user from JWT token.
     
+    Runs on the event loop; only the user lookup is sent to the threadpool,
+    since token checks are usually answered from the verification cache.
+    
     Args:
         authorization: Authorization header with Bearer token
         db: Database session
@@ -39,9 +44,8 @@ def get_current_user(authorization: str = Header(None), db: Session = Depends(ge
     token = authorization[7:]  # Remove "Bearer " prefix
     
     try:
-        auth_service = AuthenticationService(db)
-        user_id = auth_service.validate_token(token)
-        user = db.query(User).filter(User.id == user_id).first()
+        user_id = get_token_validator().validate(token)
+        user = await run_in_threadpool(db.get, User, UUID(user_id))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,19 +59,38 @@ def get_current_user(authorization: str = Header(None), db: Session = Depends(ge
         )
 
 
+async def require_owned_user(user_id: UUID, current_user: User = Depends(get_current_user)) -> User:
+    """Get the current user, checking they own the user_id in the path.
+    
+    Args:
+        user_id: User ID from path
+        current_user: Current authenticated user
+        
+    Returns:
+        Current user
+        
+    Raises:
+        HTTPException: If the path's user_id is not the current user's
+    """
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this resource",
+        )
+    return current_user
+
+
 @router.post("/{user_id}/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
-    user_id: str,
     request: TaskCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
 ):
     """Create a new task.
     
     Args:
-        user_id: User ID from path
         request: Task creation request
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Returns:
@@ -76,16 +99,9 @@ async def create_task(
     Raises:
         HTTPException: If unauthorized or invalid data
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     try:
         task_service = TaskService(db)
-        return task_service.create_task(current_user.id, request)
+        return await run_in_threadpool(task_service.create_task, current_user.id, request)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,17 +109,19 @@ async def create_task(
         )
 
 
-@router.get("/{user_id}/tasks", response_model=list[TaskResponse])
+@router.get(
+    "/{user_id}/tasks",
+    response_model=None,
+    responses={200: {"model": list[TaskResponse]}},
+)
 async def get_tasks(
-    user_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
-):
+) -> list[TaskResponse]:
     """Get all tasks for a user.
     
     Args:
-        user_id: User ID from path
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Returns:
@@ -112,30 +130,21 @@ async def get_tasks(
     Raises:
         HTTPException: If unauthorized
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     task_service = TaskService(db)
-    return task_service.get_tasks(current_user.id)
+    return await run_in_threadpool(task_service.get_tasks, current_user.id)
 
 
 @router.get("/{user_id}/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
-    user_id: str,
-    task_id: str,
-    current_user: User = Depends(get_current_user),
+    task_id: UUID,
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
 ):
     """Get a specific task.
     
     Args:
-        user_id: User ID from path
         task_id: Task ID from path
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Returns:
@@ -144,16 +153,9 @@ async def get_task(
     Raises:
         HTTPException: If unauthorized or task not found
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     try:
         task_service = TaskService(db)
-        return task_service.get_task(current_user.id, UUID(task_id))
+        return await run_in_threadpool(task_service.get_task, current_user.id, task_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,19 +165,17 @@ async def get_task(
 
 @router.put("/{user_id}/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
-    user_id: str,
-    task_id: str,
+    task_id: UUID,
     request: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
 ):
     """Update a task.
     
     Args:
-        user_id: User ID from path
         task_id: Task ID from path
         request: Task update request
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Returns:
@@ -184,16 +184,9 @@ async def update_task(
     Raises:
         HTTPException: If unauthorized, task not found, or invalid data
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     try:
         task_service = TaskService(db)
-        return task_service.update_task(current_user.id, UUID(task_id), request)
+        return await run_in_threadpool(task_service.update_task, current_user.id, task_id, request)
     except ValueError as e:
         if "not found" in str(e).lower():
             raise HTTPException(
@@ -208,32 +201,23 @@ async def update_task(
 
 @router.delete("/{user_id}/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
-    user_id: str,
-    task_id: str,
-    current_user: User = Depends(get_current_user),
+    task_id: UUID,
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
 ):
     """Delete a task.
     
     Args:
-        user_id: User ID from path
         task_id: Task ID from path
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Raises:
         HTTPException: If unauthorized or task not found
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     try:
         task_service = TaskService(db)
-        task_service.delete_task(current_user.id, UUID(task_id))
+        await run_in_threadpool(task_service.delete_task, current_user.id, task_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -243,17 +227,15 @@ async def delete_task(
 
 @router.patch("/{user_id}/tasks/{task_id}/complete", response_model=TaskResponse)
 async def toggle_task_completion(
-    user_id: str,
-    task_id: str,
-    current_user: User = Depends(get_current_user),
+    task_id: UUID,
+    current_user: User = Depends(require_owned_user),
     db: Session = Depends(get_db),
 ):
     """Toggle task completion status.
     
     Args:
-        user_id: User ID from path
         task_id: Task ID from path
-        current_user: Current authenticated user
+        current_user: Current authenticated user, who owns the path's user_id
         db: Database session
         
     Returns:
@@ -262,16 +244,9 @@ async def toggle_task_completion(
     Raises:
         HTTPException: If unauthorized or task not found
     """
-    # Verify user_id matches current user
-    if str(current_user.id) != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to access this resource",
-        )
-    
     try:
         task_service = TaskService(db)
-        return task_service.toggle_completion(current_user.id, UUID(task_id))
+        return await run_in_threadpool(task_service.toggle_completion, current_user.id, task_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
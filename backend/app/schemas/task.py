@@ -1,6 +1,6 @@
 """Task schemas."""
 
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
@@ -29,9 +29,5 @@ class TaskResponse(BaseModel):
     priority: str
     created_at: datetime
 
-    @field_serializer('id')
-    def serialize_id(self, value: UUID) -> str:
-        return str(value)
-
     class Config:
         from_attributes = True
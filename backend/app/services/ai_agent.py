@@ -1,13 +1,152 @@
 """AI Agent for processing messages and calling MCP tools."""
 
+import asyncio
 import os
-import json
-from typing import List, Dict, Any, Optional
+import httpx
+import logging
+import orjson
+import re
+from fastapi.concurrency import run_in_threadpool
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Dict, Any, AsyncIterator, NamedTuple, Optional
 from uuid import UUID
-from openai import OpenAI, APIError, APITimeoutError
-from app.models import ConversationMessage
+from openai import AsyncOpenAI, APIError, APITimeoutError
 from app.services.mcp_server import MCPServer
 
+logger = logging.getLogger(__name__)
+
+
+class ContextMessage(NamedTuple):
+    """A conversation message as the AI agent needs it."""
+
+    sender: str
+    content: str
+
+
+# Static instructions sent as the first message of every conversation
+SYSTEM_PROMPT = """You are a task management assistant. Help users manage tasks through conversation.
+
+CRITICAL: You MUST call tools for task operations. Do NOT just talk about what you would do - actually call the tools.
+
+When user asks to:
+- ADD a task: Call add_task with the description
+- LIST tasks: Call list_tasks
+- COMPLETE/MARK DONE a task: Call complete_task with the task UUID
+- DELETE a task: Call delete_task with the task UUID
+- COMPLETE or DELETE several tasks at once: Call complete_tasks or delete_tasks with the list of task UUIDs
+- UPDATE/CHANGE a task: Call update_task with the task UUID
+
+CRITICAL TASK ID EXTRACTION RULES:
+1. The user's current tasks are given in a system message just before their latest message
+2. When user says "task 1" or "task 2", they mean the "position" field in that list
+3. Extract the UUID from the "id" field of the task at that position
+4. NEVER use the position number as the task_id - always use the full UUID string
+5. Example: If user says "complete task 2", find the task with position 2, extract its "id" field (UUID), then call complete_task with that UUID
+
+After calling tools, provide a natural language response confirming what was done."""
+
+# Shared system message; the OpenAI client only serializes it, never mutates it
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Introduces the user's current tasks, sent with every message so task
+# operations need no list_tasks round trip
+TASKS_PREFIX = "Current tasks (JSON): "
+
+# Retries for transient OpenAI failures (connection errors, timeouts, 408, 409,
+# 429 and 5xx). The SDK backs off exponentially with jitter and honours the
+# Retry-After header; other errors, such as 400, fail immediately.
+OPENAI_MAX_RETRIES = 3
+
+# Most history sent with each message, in estimated tokens; older messages are
+# dropped first. Tokens are estimated at ~4 characters each, which is close
+# enough for English text without tokenizing every message.
+HISTORY_TOKEN_BUDGET = 3000
+CHARS_PER_TOKEN = 4
+
+# Short messages that name one of these actions are usually commands, so they
+# run at a low temperature. The model still chooses whether to call a tool:
+# "don't delete task 2" names an action without asking for one.
+# Listing is left out: the model answers it from the task list it is given.
+COMMAND_VERBS = frozenset({"add", "complete", "delete", "remove", "update", "change", "mark"})
+COMMAND_MAX_WORDS = 12
+COMMAND_TEMPERATURE = 0.2
+_WORD_RE = re.compile(r"\w+")
+
+# Fixed pieces of the final response built from tool results
+ERRORS_HEADER = "I encountered some errors:\n"
+OPERATIONS_HEADER = "I've completed the following operations:\n"
+DEFAULT_RESPONSE = "I didn't quite understand that. Could you rephrase your request?"
+
+
+@lru_cache(maxsize=1)
+def get_openai_api_key() -> str:
+    """Get the OpenAI API key from the environment, falling back to settings.
+    
+    Looked up once per process; call ``get_openai_api_key.cache_clear()`` to
+    re-read it. A missing key is not cached.
+    
+    Returns:
+        str: The OpenAI API key
+        
+    Raises:
+        ValueError: If OPENAI_API_KEY environment variable is not set
+    """
+    # Try to get API key from environment
+    api_key = os.getenv("OPENAI_API_KEY")
+    
+    # If not found, try to get from settings
+    if not api_key:
+        try:
+            from app.config import get_settings
+            settings = get_settings()
+            api_key = settings.openai_api_key
+        except Exception:
+            logger.exception("Error getting settings")
+    
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    return api_key
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """Get the process-wide async OpenAI client.
+    
+    Agents are created per request, so sharing one client lets every request
+    reuse the same pool of keep-alive connections to the API.
+    
+    Returns:
+        AsyncOpenAI: Client with a 30-second timeout, OPENAI_MAX_RETRIES retries
+        of transient failures, and a bounded connection pool
+        
+    Raises:
+        ValueError: If OPENAI_API_KEY environment variable is not set
+    """
+    return AsyncOpenAI(
+        api_key=get_openai_api_key(),
+        timeout=30.0,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide limit on concurrent OpenAI calls.
+    
+    Bursts of chat requests queue here instead of all hitting the API at
+    once and being rate limited. Sized by the ``openai_max_concurrency``
+    setting.
+    
+    Returns:
+        asyncio.Semaphore: Semaphore to hold while a completion is in flight
+    """
+    from app.config import get_settings
+    return asyncio.Semaphore(get_settings().openai_max_concurrency)
+
 
 class AIAgent:
     """OpenAI GPT-4 powered agent for task management.
@@ -29,33 +168,54 @@ class AIAgent:
             
         **Validates: Requirements 10.3**
         """
-        # Try to get API key from environment
-        api_key = os.getenv("OPENAI_API_KEY")
-        
-        # If not found, try to get from settings
-        if not api_key:
-            try:
-                from app.config import get_settings
-                settings = get_settings()
-                api_key = settings.openai_api_key
-            except Exception as e:
-                print(f"Error getting settings: {str(e)}")
-        
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is not set")
-        
-        # Initialize OpenAI client with 30-second timeout
-        self.client = OpenAI(api_key=api_key, timeout=30.0)
+        # Shared async client, so waiting on the API does not block the event loop
+        self.client = get_openai_client()
         self.mcp_server = mcp_server
+        # Tool schemas are static, so wrap them for the OpenAI API once
+        self.tools = [
+            {"type": "function", "function": tool}
+            for tool in mcp_server.get_tool_definitions()
+        ]
+        # Tool name -> handler(user_id, args) for executing tool calls
+        self._tool_dispatch = {
+            "add_task": lambda user_id, args: self.mcp_server.add_task(
+                user_id=user_id,
+                description=args.get("description"),
+                priority=args.get("priority", "Medium"),
+            ),
+            "list_tasks": lambda user_id, args: self.mcp_server.list_tasks(user_id=user_id),
+            "complete_task": lambda user_id, args: self.mcp_server.complete_task(
+                user_id=user_id,
+                task_id=args.get("task_id"),
+            ),
+            "delete_task": lambda user_id, args: self.mcp_server.delete_task(
+                user_id=user_id,
+                task_id=args.get("task_id"),
+            ),
+            "complete_tasks": lambda user_id, args: self.mcp_server.complete_tasks(
+                user_id=user_id,
+                task_ids=args.get("task_ids"),
+            ),
+            "delete_tasks": lambda user_id, args: self.mcp_server.delete_tasks(
+                user_id=user_id,
+                task_ids=args.get("task_ids"),
+            ),
+            "update_task": lambda user_id, args: self.mcp_server.update_task(
+                user_id=user_id,
+                task_id=args.get("task_id"),
+                description=args.get("description"),
+                priority=args.get("priority"),
+            ),
+        }
         self.model = "gpt-4o"  # Using gpt-4o as it's more available than gpt-4
         self.temperature = 0.7
         self.max_tokens = 1000
 
-    def process_message(
+    async def process_message(
         self,
         user_id: UUID,
         message: str,
-        history: List[ConversationMessage],
+        history: List[ContextMessage],
     ) -> Dict[str, Any]:
         """Process a user message and generate a response.
         
@@ -81,46 +241,41 @@ class AIAgent:
         """
         try:
             # Format messages for OpenAI API
-            formatted_messages = self._format_messages(message, history)
-            
-            # Get tool definitions
-            tools = self.mcp_server.get_tool_definitions()
-            
-            # Debug logging
-            print(f"DEBUG: Formatted messages count: {len(formatted_messages)}")
-            print(f"DEBUG: Tools available: {len(tools)}")
-            print(f"DEBUG: Tool names: {[t['name'] for t in tools]}")
-            print(f"DEBUG: First message (system prompt): {formatted_messages[0]['content'][:300]}...")
+            formatted_messages = self._format_messages(
+                message,
+                history,
+                await run_in_threadpool(self.mcp_server.list_tasks, user_id=user_id),
+            )
             
-            # Format tools for OpenAI
-            formatted_tools = [{"type": "function", "function": tool} for tool in tools]
-            print(f"DEBUG: Formatted tools sample: {formatted_tools[0]}")
+            # Skip building the debug details entirely unless they will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Formatted messages count: %d", len(formatted_messages))
+                logger.debug("Tool names: %s", [t["function"]["name"] for t in self.tools])
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=formatted_messages,
-                tools=formatted_tools,
-                tool_choice="auto",
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            async with get_openai_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=formatted_messages,
+                    tools=self.tools,
+                    **self._completion_options(message),
+                )
             
             # Parse response
             assistant_message = response.choices[0].message
             
-            # Debug logging
-            print(f"DEBUG: Response finish_reason: {response.choices[0].finish_reason}")
-            print(f"DEBUG: Assistant message content: {assistant_message.content}")
-            print(f"DEBUG: Tool calls count: {len(assistant_message.tool_calls) if assistant_message.tool_calls else 0}")
-            if assistant_message.tool_calls:
-                for tc in assistant_message.tool_calls:
-                    print(f"DEBUG: Tool call - {tc.function.name}: {tc.function.arguments}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response finish_reason: %s", response.choices[0].finish_reason)
+                logger.debug("Assistant message content: %s", assistant_message.content)
+                for tc in assistant_message.tool_calls or []:
+                    logger.debug("Tool call - %s: %s", tc.function.name, tc.function.arguments)
             
             # Execute tool calls if any
             tool_results = []
             if assistant_message.tool_calls:
-                tool_results = self._execute_tool_calls(user_id, assistant_message.tool_calls)
+                tool_results = await run_in_threadpool(
+                    self._execute_tool_calls, user_id, assistant_message.tool_calls,
+                )
             
             # Generate final response
             final_response = self._generate_final_response(
@@ -134,92 +289,212 @@ class AIAgent:
             }
             
         except APITimeoutError as e:
-            print(f"OpenAI API timeout: {str(e)}")
+            logger.warning("OpenAI API timeout: %s", e)
             return {
                 "response": "The AI service is taking longer than expected. Please try again.",
                 "tool_calls": [],
             }
         except APIError as e:
-            print(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI API error: %s", e)
             return {
                 "response": "I encountered an error while processing your request. Please try again.",
                 "tool_calls": [],
             }
-        except Exception as e:
-            print(f"Unexpected error in AIAgent.process_message: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+        except Exception:
+            logger.exception("Unexpected error in AIAgent.process_message")
             return {
                 "response": "An unexpected error occurred. Please try again.",
                 "tool_calls": [],
             }
 
+    async def stream_message(
+        self,
+        user_id: UUID,
+        message: str,
+        history: List[ContextMessage],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Process a user message, yielding the response as it is generated.
+        
+        Same flow as process_message, but the completion is streamed: text is
+        yielded as soon as the model produces it, and tool calls run as soon as
+        the stream ends. The final response can contain more than the streamed
+        text (tool errors or an operations summary), so clients should replace
+        what they showed with the ``done`` event's response.
+        
+        Args:
+            user_id: ID of the user
+            message: The user message to process
+            history: Conversation history for context
+            
+        Yields:
+            dict: ``{"type": "token", "content": str}`` for each piece of text,
+            then one ``{"type": "done", "response": str, "tool_calls": list}``
+            
+        **Validates: Requirements 4.3, 5.1, 5.2, 5.5**
+        """
+        try:
+            formatted_messages = self._format_messages(
+                message,
+                history,
+                await run_in_threadpool(self.mcp_server.list_tasks, user_id=user_id),
+            )
+            
+            # Hold a slot for as long as the stream is open
+            async with get_openai_semaphore():
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=formatted_messages,
+                    tools=self.tools,
+                    **self._completion_options(message),
+                    stream=True,
+                )
+                
+                content_parts: List[str] = []
+                # Tool calls arrive in fragments keyed by their index in the message
+                tool_call_parts: Dict[int, Dict[str, List[str]]] = {}
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {"type": "token", "content": delta.content}
+                    for tool_call in delta.tool_calls or []:
+                        parts = tool_call_parts.setdefault(tool_call.index, {"name": [], "arguments": []})
+                        if tool_call.function.name:
+                            parts["name"].append(tool_call.function.name)
+                        if tool_call.function.arguments:
+                            parts["arguments"].append(tool_call.function.arguments)
+            
+            
+            # Execute tool calls if any
+            tool_results = []
+            if tool_call_parts:
+                tool_calls = [
+                    SimpleNamespace(function=SimpleNamespace(
+                        name="".join(parts["name"]),
+                        arguments="".join(parts["arguments"]),
+                    ))
+                    for _, parts in sorted(tool_call_parts.items())
+                ]
+                tool_results = await run_in_threadpool(self._execute_tool_calls, user_id, tool_calls)
+            
+            yield {
+                "type": "done",
+                "response": self._generate_final_response("".join(content_parts), tool_results),
+                "tool_calls": tool_results,
+            }
+            
+        except APITimeoutError as e:
+            logger.warning("OpenAI API timeout: %s", e)
+            yield {
+                "type": "done",
+                "response": "The AI service is taking longer than expected. Please try again.",
+                "tool_calls": [],
+            }
+        except APIError as e:
+            logger.error("OpenAI API error: %s", e)
+            yield {
+                "type": "done",
+                "response": "I encountered an error while processing your request. Please try again.",
+                "tool_calls": [],
+            }
+        except Exception:
+            logger.exception("Unexpected error in AIAgent.stream_message")
+            yield {
+                "type": "done",
+                "response": "An unexpected error occurred. Please try again.",
+                "tool_calls": [],
+            }
+
+    def _completion_options(self, message: str) -> Dict[str, Any]:
+        """Choose tool_choice, temperature and max_tokens for a message.
+        
+        A short message naming a task action (e.g. "delete task 2") is
+        likely a command and gets a low temperature. Tool use stays up to the
+        model, and max_tokens stays at the default so batch tool calls carrying
+        many task IDs are not cut off.
+        
+        Args:
+            message: The current user message
+            
+        Returns:
+            dict: Keyword arguments for chat.completions.create
+        """
+        words = _WORD_RE.findall(message.lower())
+        is_command = len(words) < COMMAND_MAX_WORDS and not COMMAND_VERBS.isdisjoint(words)
+        return {
+            "tool_choice": "auto",
+            "temperature": COMMAND_TEMPERATURE if is_command else self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    @staticmethod
+    def _trim_history(
+        history: List[ContextMessage],
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+    ) -> List[ContextMessage]:
+        """Keep the newest messages that fit in the token budget.
+        
+        Args:
+            history: Conversation history in chronological order
+            token_budget: Maximum estimated tokens to keep
+            
+        Returns:
+            list: The most recent messages in chronological order
+        """
+        remaining = token_budget * CHARS_PER_TOKEN
+        start = len(history)
+        while start > 0 and len(history[start - 1].content) <= remaining:
+            start -= 1
+            remaining -= len(history[start].content)
+        return history[start:]
+
     def _format_messages(
         self,
         message: str,
-        history: List[ConversationMessage],
+        history: List[ContextMessage],
+        tasks: List[Dict[str, Any]],
     ) -> List[Dict[str, str]]:
         """Format conversation history and current message for OpenAI API.
         
+        History is trimmed to the newest messages within HISTORY_TOKEN_BUDGET,
+        so long pasted messages cannot inflate the request. The user's current
+        tasks go in a system message right before the current message, so the
+        model can act on "task 2" in one call. Placing them after the history
+        keeps the system prompt and history as a stable prefix between turns.
+        
         Args:
             message: The current user message
             history: Conversation history
+            tasks: The user's tasks, as returned by MCPServer.list_tasks
             
         Returns:
             list: Formatted messages for OpenAI API
             
-        **Validates: Requirements 4.3**
+        **Validates: Requirements 4.3, 12.2**
         """
-        messages = [
+        task_list = [
             {
-                "role": "system",
-                "content": self._format_system_prompt(),
+                "position": position,
+                "id": task["id"],
+                "description": task["description"],
+                "priority": task["priority"],
+                "completed": task["completed"],
             }
+            for position, task in enumerate(tasks, start=1)
         ]
         
-        # Add conversation history
-        for msg in history:
-            role = "user" if msg.sender == "user" else "assistant"
-            messages.append({
-                "role": role,
-                "content": msg.content,
-            })
-        
-        # Add current message with explicit instruction to use tools
-        messages.append({
-            "role": "user",
-            "content": message,
-        })
-        
-        return messages
-
-    def _format_system_prompt(self) -> str:
-        """Create system prompt for task management context.
-        
-        Returns:
-            str: System prompt for the AI agent
-            
-        **Validates: Requirements 2.1, 2.2, 2.3, 2.4, 2.5, 12.1, 12.2, 12.3, 12.4, 12.5**
-        """
-        return """You are a task management assistant. Help users manage tasks through conversation.
-
-CRITICAL: You MUST call tools for task operations. Do NOT just talk about what you would do - actually call the tools.
-
-When user asks to:
-- ADD a task: Call add_task with the description
-- LIST tasks: Call list_tasks
-- COMPLETE/MARK DONE a task: Call list_tasks first, then complete_task with the task UUID
-- DELETE a task: Call list_tasks first, then delete_task with the task UUID  
-- UPDATE/CHANGE a task: Call list_tasks first, then update_task with the task UUID
-
-CRITICAL TASK ID EXTRACTION RULES:
-1. When user says "task 1" or "task 2", they mean the position in the list
-2. You MUST call list_tasks first to get the actual UUIDs
-3. Extract the UUID from the "id" field of the task at that position
-4. NEVER use the position number as the task_id - always use the full UUID string
-5. Example: If user says "complete task 2", call list_tasks, find the 2nd task, extract its "id" field (UUID), then call complete_task with that UUID
-
-After calling tools, provide a natural language response confirming what was done."""
+        # System prompt, then the history, then the tasks and current message, in one pass
+        return [
+            SYSTEM_MESSAGE,
+            *(
+                {"role": "user" if msg.sender == "user" else "assistant", "content": msg.content}
+                for msg in self._trim_history(history)
+            ),
+            {"role": "system", "content": TASKS_PREFIX + orjson.dumps(task_list).decode()},
+            {"role": "user", "content": message},
+        ]
 
     def _execute_tool_calls(
         self,
@@ -240,69 +515,26 @@ After calling tools, provide a natural language response confirming what was don
         results = []
         
         for tool_call in tool_calls:
+            tool_name = tool_call.function.name
+            handler = self._tool_dispatch.get(tool_name)
+            if handler is None:
+                results.append({
+                    "tool": tool_name,
+                    "status": "error",
+                    "error": f"Unknown tool: {tool_name}",
+                })
+                continue
+            
             try:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-                
-                # Execute the appropriate tool
-                if tool_name == "add_task":
-                    result = self.mcp_server.add_task(
-                        user_id=user_id,
-                        description=tool_args.get("description"),
-                        priority=tool_args.get("priority", "Medium"),
-                    )
-                    results.append({
-                        "tool": tool_name,
-                        "status": "success",
-                        "result": result,
-                    })
-                    
-                elif tool_name == "list_tasks":
-                    result = self.mcp_server.list_tasks(user_id=user_id)
-                    results.append({
-                        "tool": tool_name,
-                        "status": "success",
-                        "result": result,
-                    })
-                    
-                elif tool_name == "complete_task":
-                    result = self.mcp_server.complete_task(
-                        user_id=user_id,
-                        task_id=tool_args.get("task_id"),
-                    )
-                    results.append({
-                        "tool": tool_name,
-                        "status": "success",
-                        "result": result,
-                    })
-                    
-                elif tool_name == "delete_task":
-                    result = self.mcp_server.delete_task(
-                        user_id=user_id,
-                        task_id=tool_args.get("task_id"),
-                    )
-                    results.append({
-                        "tool": tool_name,
-                        "status": "success",
-                        "result": result,
-                    })
-                    
-                elif tool_name == "update_task":
-                    result = self.mcp_server.update_task(
-                        user_id=user_id,
-                        task_id=tool_args.get("task_id"),
-                        description=tool_args.get("description"),
-                        priority=tool_args.get("priority"),
-                    )
-                    results.append({
-                        "tool": tool_name,
-                        "status": "success",
-                        "result": result,
-                    })
-                    
+                tool_args = orjson.loads(tool_call.function.arguments)
+                results.append({
+                    "tool": tool_name,
+                    "status": "success",
+                    "result": handler(user_id, tool_args),
+                })
             except Exception as e:
                 results.append({
-                    "tool": tool_call.function.name,
+                    "tool": tool_name,
                     "status": "error",
                     "error": str(e),
                 })
@@ -325,24 +557,34 @@ After calling tools, provide a natural language response confirming what was don
             
         **Validates: Requirements 5.1, 5.2, 5.5**
         """
+        # Split the results into errors and successes in a single pass
+        errors: List[Dict[str, Any]] = []
+        successes: List[Dict[str, Any]] = []
+        for result in tool_results:
+            if result["status"] == "error":
+                errors.append(result)
+            elif result["status"] == "success":
+                successes.append(result)
+        
+        # Common case: the assistant explained the result itself and nothing
+        # failed, so there is nothing to append
+        if assistant_content and not errors:
+            return assistant_content
+        
+        # Collect the pieces and join once at the end
+        parts: List[str] = []
+        
         # If there's assistant content, use it as the base
         if assistant_content:
-            response = assistant_content
-        else:
-            response = ""
+            parts.append(assistant_content)
         
         # Add tool results if any
         if tool_results:
-            # Check if there are any errors
-            errors = [r for r in tool_results if r["status"] == "error"]
-            successes = [r for r in tool_results if r["status"] == "success"]
-            
             if errors:
-                if response:
-                    response += "\n\n"
-                response += "I encountered some errors:\n"
-                for error in errors:
-                    response += f"- {error['tool']}: {error['error']}\n"
+                if parts:
+                    parts.append("\n\n")
+                parts.append(ERRORS_HEADER)
+                parts.extend(f"- {error['tool']}: {error['error']}\n" for error in errors)
             
             # If no assistant content but we have successful tool results, generate a summary
             # BUT: Don't add summary if list_tasks was called (let assistant handle the formatting)
@@ -351,26 +593,32 @@ After calling tools, provide a natural language response confirming what was don
                 has_list_tasks = any(r["tool"] == "list_tasks" for r in successes)
                 
                 if not has_list_tasks:
-                    if response:
-                        response += "\n\n"
-                    response += "I've completed the following operations:\n"
+                    if parts:
+                        parts.append("\n\n")
+                    parts.append(OPERATIONS_HEADER)
                     for result in successes:
                         tool_name = result["tool"]
                         if tool_name == "add_task":
                             task = result["result"]
-                            response += f"✓ Added task: {task['description']} (Priority: {task['priority']})\n"
+                            parts.append(f"✓ Added task: {task['description']} (Priority: {task['priority']})\n")
                         elif tool_name == "complete_task":
                             task = result["result"]
                             status = "completed" if task["completed"] else "marked as incomplete"
-                            response += f"✓ Task marked as {status}: {task['description']}\n"
+                            parts.append(f"✓ Task marked as {status}: {task['description']}\n")
                         elif tool_name == "delete_task":
-                            response += f"✓ Task deleted successfully\n"
+                            parts.append("✓ Task deleted successfully\n")
+                        elif tool_name == "complete_tasks":
+                            for task in result["result"]["tasks"]:
+                                status = "completed" if task["completed"] else "incomplete"
+                                parts.append(f"✓ Task marked as {status}: {task['description']}\n")
+                        elif tool_name == "delete_tasks":
+                            parts.append(f"✓ Deleted {result['result']['deleted']} tasks\n")
                         elif tool_name == "update_task":
                             task = result["result"]
-                            response += f"✓ Updated task: {task['description']} (Priority: {task['priority']})\n"
+                            parts.append(f"✓ Updated task: {task['description']} (Priority: {task['priority']})\n")
         
         # If still no response, provide a default
-        if not response:
-            response = "I didn't quite understand that. Could you rephrase your request?"
+        if not parts:
+            return DEFAULT_RESPONSE
         
-        return response
+        return "".join(parts)
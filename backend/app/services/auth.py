@@ -1,13 +1,107 @@
 """Authentication service for user registration and login."""
 
 import bcrypt
+import hashlib
 import jwt
+import threading
+import time
+from cachetools import TTLCache
 from datetime import datetime, timedelta
+from functools import lru_cache
 from sqlalchemy.orm import Session
 from app.models import User
 from app.config import get_settings
 from app.schemas import SignupRequest, SigninRequest, AuthResponse
 
+# Verified token hash -> (user_id, exp), so repeated requests with the same
+# token skip JWT verification. Raw tokens are never stored.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str) -> str:
+    """Return the cache key for a token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def clear_token_cache() -> None:
+    """Forget all cached token verifications (e.g. between tests)."""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token's cached verification, e.g. when the user logs out.
+    
+    This only affects the cache; the token itself stays valid until it expires.
+    
+    Args:
+        token: JWT token without the "Bearer " prefix
+    """
+    with _token_cache_lock:
+        _token_cache.pop(_token_cache_key(token), None)
+
+
+class AuthTokenValidator:
+    """Verifies JWT tokens. Holds no request state, so one instance serves the process."""
+
+    def __init__(self, secret_key: str, algorithm: str):
+        """Initialize token validator.
+        
+        Args:
+            secret_key: Key the tokens are signed with
+            algorithm: JWT signing algorithm
+        """
+        self.secret_key = secret_key
+        self.algorithms = [algorithm]
+
+    def validate(self, token: str) -> str:
+        """Validate JWT token and extract user_id.
+        
+        Successful verifications are cached for a short time (never past the
+        token's own expiry), so repeated requests skip signature verification.
+        
+        Args:
+            token: JWT token to validate
+            
+        Returns:
+            User ID extracted from token
+            
+        Raises:
+            ValueError: If token is invalid or expired
+        """
+        key = _token_cache_key(token)
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        if cached is not None:
+            user_id, exp = cached
+            if exp is None or exp > time.time():
+                return user_id
+        
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+            user_id = payload.get("user_id")
+            if not user_id:
+                raise ValueError("Invalid token: missing user_id")
+            with _token_cache_lock:
+                _token_cache[key] = (user_id, payload.get("exp"))
+            return user_id
+        except jwt.ExpiredSignatureError:
+            raise ValueError("Token has expired")
+        except jwt.InvalidTokenError as e:
+            raise ValueError(f"Invalid token: {str(e)}")
+
+
+@lru_cache(maxsize=1)
+def get_token_validator() -> AuthTokenValidator:
+    """Get the process-wide token validator.
+    
+    Built from settings on first use; call ``get_token_validator.cache_clear()``
+    after changing JWT settings.
+    """
+    settings = get_settings()
+    return AuthTokenValidator(settings.jwt_secret_key, settings.jwt_algorithm)
+
 
 class AuthenticationService:
     """Manages user registration, login, and JWT token operations."""
@@ -20,9 +114,14 @@ class AuthenticationService:
         """
         self.db = db
         self.settings = get_settings()
+        # Read once here rather than on every token generated
+        self._secret_key = self.settings.jwt_secret_key
+        self._algorithm = self.settings.jwt_algorithm
+        self._expiration_hours = self.settings.jwt_expiration_hours
+        self._token_lifetime = timedelta(hours=self._expiration_hours)
 
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt.
+        """Hash password using bcrypt with the configured cost factor.
         
         Args:
             password: Plain text password
@@ -30,7 +129,7 @@ class AuthenticationService:
         Returns:
             Hashed password
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.settings.bcrypt_rounds)
         return bcrypt.hashpw(password.encode(), salt).decode()
 
     def verify_password(self, password: str, password_hash: str) -> bool:
@@ -54,18 +153,15 @@ class AuthenticationService:
         Returns:
             Tuple of (token, expiration_hours)
         """
-        expiration = datetime.utcnow() + timedelta(hours=self.settings.jwt_expiration_hours)
+        # One clock read, so "exp" is exactly the configured lifetime after "iat"
+        now = datetime.utcnow()
         payload = {
             "user_id": str(user_id),
-            "exp": expiration,
-            "iat": datetime.utcnow(),
+            "exp": now + self._token_lifetime,
+            "iat": now,
         }
-        token = jwt.encode(
-            payload,
-            self.settings.jwt_secret_key,
-            algorithm=self.settings.jwt_algorithm,
-        )
-        return token, self.settings.jwt_expiration_hours
+        token = jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
+        return token, self._expiration_hours
 
     def validate_token(self, token: str) -> str:
         """Validate JWT token and extract user_id.
@@ -79,20 +175,7 @@ class AuthenticationService:
         Raises:
             ValueError: If token is invalid or expired
         """
-        try:
-            payload = jwt.decode(
-                token,
-                self.settings.jwt_secret_key,
-                algorithms=[self.settings.jwt_algorithm],
-            )
-            user_id = payload.get("user_id")
-            if not user_id:
-                raise ValueError("Invalid token: missing user_id")
-            return user_id
-        except jwt.ExpiredSignatureError:
-            raise ValueError("Token has expired")
-        except jwt.InvalidTokenError as e:
-            raise ValueError(f"Invalid token: {str(e)}")
+        return get_token_validator().validate(token)
 
     def signup(self, request: SignupRequest) -> AuthResponse:
         """Register a new user.
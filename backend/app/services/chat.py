@@ -1,14 +1,62 @@
 """Chat service for managing conversational task operations."""
 
+import logging
+import re
+import threading
+from cachetools import TTLCache
+from collections import deque
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.repositories import ChatRepository
 from app.models import ConversationMessage
-from app.services.ai_agent import AIAgent
+from app.services.ai_agent import AIAgent, ContextMessage
 from app.services.mcp_server import MCPServer
 from uuid import UUID
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Most messages kept per user in the context cache
+HISTORY_CACHE_SIZE = 20
+
+
+# Keywords in an error message -> user-friendly response, in priority order
+ERROR_RESPONSES = {
+    "not found": "I couldn't find that task. Could you provide more details or check the task ID?",
+    "permission": "You don't have permission to perform that action.",
+    "unauthorized": "You don't have permission to perform that action.",
+    "invalid": "I didn't quite understand that. Could you rephrase your request?",
+    "timeout": "The operation took too long. Please try again.",
+}
+GENERIC_ERROR_RESPONSE = (
+    "I encountered an error while performing that operation. Please try again or rephrase your request."
+)
+# Finds every error keyword in a single pass over the message
+_ERROR_KEYWORDS_RE = re.compile("|".join(map(re.escape, ERROR_RESPONSES)), re.IGNORECASE)
+
+# user_id -> that user's most recent messages (oldest first), so each chat turn
+# can build its AI context without reading history back from the database.
+# Entries expire quickly because other workers may add messages for the user.
+_history_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_history_cache_lock = threading.Lock()
+
+
+def clear_history_cache() -> None:
+    """Forget all cached conversation context (e.g. between tests)."""
+    with _history_cache_lock:
+        _history_cache.clear()
+
+
+def invalidate_history(user_id: UUID) -> None:
+    """Drop a user's cached conversation context, e.g. after deleting messages.
+    
+    Args:
+        user_id: ID of the user
+    """
+    with _history_cache_lock:
+        _history_cache.pop(user_id, None)
+
 
 class ChatService:
     """Service layer for chat message processing and orchestration."""
@@ -34,14 +82,14 @@ class ChatService:
         # Initialize AI agent
         self.ai_agent = AIAgent(mcp_server)
 
-    def process_message(self, user_id: UUID, message: str) -> dict:
+    async def process_message(self, user_id: UUID, message: str) -> dict:
         """Process a user message and generate a response.
         
         This is the main orchestration method that:
-        1. Validates and stores the user message
+        1. Validates the user message
         2. Retrieves conversation history for context
         3. Generates an AI response using the AIAgent
-        4. Stores the AI response
+        4. Stores the user message and AI response in one transaction
         5. Returns both messages
         
         Args:
@@ -60,55 +108,119 @@ class ChatService:
         if not message or not message.strip():
             raise ValueError("Message cannot be empty")
         
+        # Timestamp the user message on arrival, not when it is stored
+        received_at = datetime.utcnow()
+        
         try:
-            # Store user message
-            user_message = self.repository.add_message(
-                user_id=user_id,
-                content=message.strip(),
-                sender="user",
-            )
-            
-            # Retrieve conversation history for context (last 10 messages)
-            history = self.get_recent_messages_for_context(user_id, count=10)
+            # Retrieve conversation history for context (last 10 messages);
+            # the current message is passed to the agent separately. The
+            # session is sync, so database work runs in the threadpool to keep
+            # the event loop free while other requests wait on OpenAI.
+            history = await run_in_threadpool(self.get_recent_messages_for_context, user_id, 10)
             
             # Generate AI response using AIAgent
             try:
-                ai_response = self.ai_agent.process_message(user_id, message.strip(), history)
+                ai_response = await self.ai_agent.process_message(user_id, message.strip(), history)
                 response_text = ai_response["response"]
             except Exception as e:
                 # Handle tool execution failures with user-friendly message
-                print(f"Error in AIAgent.process_message: {str(e)}")
-                import traceback
-                print(traceback.format_exc())
+                logger.exception("Error in AIAgent.process_message")
                 response_text = self._format_error_response(str(e))
             
-            # Store assistant response
-            assistant_message = self.repository.add_message(
-                user_id=user_id,
-                content=response_text,
-                sender="assistant",
+            return await run_in_threadpool(
+                self._store_turn, user_id, message.strip(), received_at, response_text,
             )
+        except Exception:
+            logger.exception("Error in ChatService.process_message")
+            raise
+
+    async def stream_message(self, user_id: UUID, message: str) -> AsyncIterator[Dict[str, Any]]:
+        """Process a user message, yielding the AI response as it is generated.
+        
+        Same flow as process_message, but the response text is yielded as soon
+        as the model produces it. Both messages are stored once the response is
+        complete.
+        
+        Args:
+            user_id: ID of the user sending the message
+            message: The message content
+            
+        Yields:
+            dict: ``{"type": "token", "content": str}`` for each piece of text,
+            then one ``{"type": "done", "user_message": dict,
+            "assistant_message": dict}`` carrying the stored messages
+            
+        Raises:
+            ValueError: If message is empty or invalid
             
-            return {
-                "user_message": {
-                    "id": str(user_message.id),
-                    "content": user_message.content,
-                    "sender": user_message.sender,
-                    "timestamp": user_message.created_at.isoformat(),
-                },
-                "assistant_message": {
-                    "id": str(assistant_message.id),
-                    "content": assistant_message.content,
-                    "sender": assistant_message.sender,
-                    "timestamp": assistant_message.created_at.isoformat(),
-                },
-            }
-        except Exception as e:
-            print(f"Error in ChatService.process_message: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+        **Validates: Requirements 1.1, 1.3, 1.4, 4.1, 4.2, 4.3, 5.1, 5.2, 5.3, 5.5, 9.1, 9.2, 9.3**
+        """
+        if not message or not message.strip():
+            raise ValueError("Message cannot be empty")
+        
+        received_at = datetime.utcnow()
+        
+        try:
+            history = await run_in_threadpool(self.get_recent_messages_for_context, user_id, 10)
+            
+            response_text = None
+            try:
+                async for event in self.ai_agent.stream_message(user_id, message.strip(), history):
+                    if event["type"] == "done":
+                        response_text = event["response"]
+                    else:
+                        yield event
+            except Exception as e:
+                logger.exception("Error in AIAgent.stream_message")
+                response_text = self._format_error_response(str(e))
+            
+            stored = await run_in_threadpool(
+                self._store_turn, user_id, message.strip(), received_at, response_text or GENERIC_ERROR_RESPONSE,
+            )
+            yield {"type": "done", **stored}
+        except Exception:
+            logger.exception("Error in ChatService.stream_message")
             raise
 
+    def _store_turn(self, user_id: UUID, message: str, received_at: datetime, response_text: str) -> dict:
+        """Store a user message and the assistant's response with a single commit.
+        
+        Args:
+            user_id: ID of the user
+            message: The user's (stripped) message
+            received_at: When the user message arrived
+            response_text: The assistant's response
+            
+        Returns:
+            dict: Contains user_message and assistant_message with all fields
+        """
+        user_message, assistant_message = self.repository.add_messages([
+            (user_id, message, "user", received_at),
+            (user_id, response_text, "assistant", datetime.utcnow()),
+        ])
+        
+        # Extend the cached context (if any) with what was just stored
+        with _history_cache_lock:
+            cached = _history_cache.get(user_id)
+            if cached is not None:
+                cached.append(ContextMessage(user_message.sender, user_message.content))
+                cached.append(ContextMessage(assistant_message.sender, assistant_message.content))
+        
+        return {
+            "user_message": {
+                "id": str(user_message.id),
+                "content": user_message.content,
+                "sender": user_message.sender,
+                "timestamp": user_message.created_at.isoformat(),
+            },
+            "assistant_message": {
+                "id": str(assistant_message.id),
+                "content": assistant_message.content,
+                "sender": assistant_message.sender,
+                "timestamp": assistant_message.created_at.isoformat(),
+            },
+        }
+
     def get_conversation_history(self, user_id: UUID, limit: int = 50, offset: int = 0) -> List[ConversationMessage]:
         """Retrieve conversation history for a user.
         
@@ -124,19 +236,47 @@ class ChatService:
         """
         return self.repository.get_messages(user_id, limit=limit, offset=offset)
 
-    def get_recent_messages_for_context(self, user_id: UUID, count: int = 10) -> List[ConversationMessage]:
+    def get_recent_messages_for_context(self, user_id: UUID, count: int = 10) -> List[ContextMessage]:
         """Retrieve recent messages for AI context.
         
+        Served from the process-wide context cache when the user has an entry;
+        otherwise read from the database and cached for the following turns.
+        
         Args:
             user_id: ID of the user
             count: Number of recent messages to retrieve (default 10)
             
         Returns:
-            List[ConversationMessage]: Most recent messages in chronological order
+            List[ContextMessage]: Most recent messages in chronological order
             
         **Validates: Requirements 4.3**
         """
-        return self.repository.get_recent_messages(user_id, count=count)
+        if count <= HISTORY_CACHE_SIZE:
+            with _history_cache_lock:
+                cached = _history_cache.get(user_id)
+                if cached is not None:
+                    return list(cached)[-count:] if count else []
+        
+        messages = [
+            ContextMessage(message.sender, message.content)
+            for message in self.repository.get_recent_messages(user_id, count=max(count, HISTORY_CACHE_SIZE))
+        ]
+        with _history_cache_lock:
+            _history_cache[user_id] = deque(messages, maxlen=HISTORY_CACHE_SIZE)
+        return messages[-count:] if count else []
+
+    def delete_history(self, user_id: UUID) -> int:
+        """Delete all of a user's messages and drop their cached context.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            int: Number of messages deleted
+        """
+        count = self.repository.delete_messages(user_id)
+        invalidate_history(user_id)
+        return count
 
     def _format_error_response(self, error_message: str) -> str:
         """Format an error message in a user-friendly way.
@@ -149,16 +289,11 @@ class ChatService:
             
         **Validates: Requirements 5.3, 9.2, 9.3**
         """
-        # Handle specific error types
-        if "not found" in error_message.lower():
-            return "I couldn't find that task. Could you provide more details or check the task ID?"
-        elif "permission" in error_message.lower() or "unauthorized" in error_message.lower():
-            return "You don't have permission to perform that action."
-        elif "invalid" in error_message.lower():
-            return "I didn't quite understand that. Could you rephrase your request?"
-        elif "timeout" in error_message.lower():
-            return "The operation took too long. Please try again."
-        else:
-            # Generic error message
-            return "I encountered an error while performing that operation. Please try again or rephrase your request."
+        found = {keyword.lower() for keyword in _ERROR_KEYWORDS_RE.findall(error_message)}
+        if found:
+            # Several keywords may appear; the highest-priority one wins
+            for keyword, response in ERROR_RESPONSES.items():
+                if keyword in found:
+                    return response
+        return GENERIC_ERROR_RESPONSE
 
@@ -1,12 +1,138 @@
 """MCP Server for exposing task operations as tools for AI agents."""
 
+import re
 from sqlalchemy.orm import Session
-from app.services.task import TaskService
+from app.services.task import VALID_PRIORITIES, TaskService, strip_description
 from app.models import Task
+from app.schemas import TaskCreate, TaskUpdate
 from uuid import UUID
 from typing import List, Dict, Any, Optional
 
 
+# Canonical UUID text, the form list_tasks hands to the agent. Checked before
+# parsing so malformed IDs are rejected without raising inside UUID().
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+# Tool schemas offered to the AI agent, sorted by name. They are sent at the
+# start of every completion request, so keeping them byte-identical between
+# requests lets OpenAI reuse its cached prompt prefix.
+TOOL_DEFINITIONS: List[Dict[str, Any]] = sorted(
+    [
+        {
+            "name": "add_task",
+            "description": "Add a new task to the user's task list",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "description": {
+                        "type": "string",
+                        "description": "The task description",
+                    },
+                    "priority": {
+                        "type": "string",
+                        "enum": ["Low", "Medium", "High"],
+                        "description": "Task priority (optional, defaults to Medium)",
+                    },
+                },
+                "required": ["description"],
+            },
+        },
+        {
+            "name": "list_tasks",
+            "description": "List all tasks for the user",
+            "input_schema": {
+                "type": "object",
+                "properties": {},
+            },
+        },
+        {
+            "name": "complete_task",
+            "description": "Mark a task as complete or incomplete",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "string",
+                        "description": "The ID of the task to complete",
+                    },
+                },
+                "required": ["task_id"],
+            },
+        },
+        {
+            "name": "delete_task",
+            "description": "Delete a task from the user's task list",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "string",
+                        "description": "The ID of the task to delete",
+                    },
+                },
+                "required": ["task_id"],
+            },
+        },
+        {
+            "name": "complete_tasks",
+            "description": "Mark several tasks as complete or incomplete at once (each is toggled)",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The IDs of the tasks to complete",
+                    },
+                },
+                "required": ["task_ids"],
+            },
+        },
+        {
+            "name": "delete_tasks",
+            "description": "Delete several tasks from the user's task list at once",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The IDs of the tasks to delete",
+                    },
+                },
+                "required": ["task_ids"],
+            },
+        },
+        {
+            "name": "update_task",
+            "description": "Update a task's description or priority",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "task_id": {
+                        "type": "string",
+                        "description": "The ID of the task to update",
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "New task description (optional)",
+                    },
+                    "priority": {
+                        "type": "string",
+                        "enum": ["Low", "Medium", "High"],
+                        "description": "New task priority (optional)",
+                    },
+                },
+                "required": ["task_id"],
+            },
+        },
+    ],
+    key=lambda tool: tool["name"],
+)
+
+
 class MCPServer:
     """Exposes task operations as MCP tools for AI agent."""
 
@@ -20,6 +146,40 @@ class MCPServer:
         self.db = db
         self.task_service = task_service
 
+    @staticmethod
+    def _parse_task_id(task_id: str) -> UUID:
+        """Parse a task ID passed in by the agent.
+        
+        Args:
+            task_id: Task ID in canonical UUID form
+            
+        Returns:
+            UUID: Parsed task ID
+            
+        Raises:
+            ValueError: If the task ID is not a canonical UUID
+        """
+        if not isinstance(task_id, str) or not _UUID_RE.match(task_id):
+            raise ValueError(f"Invalid task ID format: {task_id}")
+        return UUID(task_id)
+
+    @classmethod
+    def _parse_task_ids(cls, task_ids: List[str]) -> List[UUID]:
+        """Parse a list of task IDs passed in by the agent.
+        
+        Args:
+            task_ids: Task IDs in canonical UUID form
+            
+        Returns:
+            List[UUID]: Parsed task IDs, in the given order
+            
+        Raises:
+            ValueError: If the list is empty or any task ID is malformed
+        """
+        if not isinstance(task_ids, list) or not task_ids:
+            raise ValueError("task_ids must be a non-empty list of task IDs")
+        return [cls._parse_task_id(task_id) for task_id in task_ids]
+
     def add_task(self, user_id: UUID, description: str, priority: str = "Medium") -> Dict[str, Any]:
         """Add a new task via MCP tool.
         
@@ -36,14 +196,14 @@ class MCPServer:
             
         **Validates: Requirements 3.1, 11.2**
         """
-        if not description or not description.strip():
+        description = strip_description(description)
+        if not description:
             raise ValueError("Task description cannot be empty")
         
-        if priority not in ["Low", "Medium", "High"]:
+        if priority not in VALID_PRIORITIES:
             raise ValueError(f"Invalid priority: {priority}. Must be Low, Medium, or High")
         
-        from app.schemas import TaskCreate
-        task_create = TaskCreate(description=description.strip(), priority=priority)
+        task_create = TaskCreate(description=description, priority=priority)
         task = self.task_service.create_task(user_id=user_id, request=task_create)
         
         return {
@@ -65,18 +225,8 @@ class MCPServer:
             
         **Validates: Requirements 3.2, 11.1**
         """
-        tasks = self.task_service.get_tasks(user_id=user_id)
-        
-        return [
-            {
-                "id": str(task.id),
-                "description": task.description,
-                "priority": task.priority,
-                "completed": task.completed,
-                "created_at": task.created_at.isoformat(),
-            }
-            for task in tasks
-        ]
+        # The database returns the rows already shaped and stringified
+        return self.task_service.list_tasks_for_mcp(user_id=user_id)
 
     def complete_task(self, user_id: UUID, task_id: str) -> Dict[str, Any]:
         """Mark a task as complete/incomplete via MCP tool.
@@ -93,10 +243,7 @@ class MCPServer:
             
         **Validates: Requirements 3.3, 11.3**
         """
-        try:
-            task_uuid = UUID(task_id)
-        except ValueError:
-            raise ValueError(f"Invalid task ID format: {task_id}")
+        task_uuid = self._parse_task_id(task_id)
         
         task = self.task_service.toggle_completion(
             user_id=user_id,
@@ -126,10 +273,7 @@ class MCPServer:
             
         **Validates: Requirements 3.4, 11.4**
         """
-        try:
-            task_uuid = UUID(task_id)
-        except ValueError:
-            raise ValueError(f"Invalid task ID format: {task_id}")
+        task_uuid = self._parse_task_id(task_id)
         
         self.task_service.delete_task(
             user_id=user_id,
@@ -141,6 +285,75 @@ class MCPServer:
             "message": f"Task {task_id} deleted successfully",
         }
 
+    def complete_tasks(self, user_id: UUID, task_ids: List[str]) -> Dict[str, Any]:
+        """Toggle the completion status of several tasks via MCP tool.
+        
+        Args:
+            user_id: ID of the user
+            task_ids: IDs of the tasks to toggle
+            
+        Returns:
+            dict: Updated tasks, plus the IDs that were not found
+            
+        Raises:
+            ValueError: If an ID is malformed or none of the tasks were found
+            
+        **Validates: Requirements 3.3, 11.3**
+        """
+        task_uuids = self._parse_task_ids(task_ids)
+        
+        tasks = self.task_service.toggle_completion_bulk(
+            user_id=user_id,
+            task_ids=task_uuids,
+        )
+        if not tasks:
+            raise ValueError("Tasks not found")
+        
+        found = {task.id for task in tasks}
+        return {
+            "tasks": [
+                {
+                    "id": str(task.id),
+                    "description": task.description,
+                    "priority": task.priority,
+                    "completed": task.completed,
+                    "created_at": task.created_at.isoformat(),
+                }
+                for task in tasks
+            ],
+            "not_found": [task_id for task_id, task_uuid in zip(task_ids, task_uuids) if task_uuid not in found],
+        }
+
+    def delete_tasks(self, user_id: UUID, task_ids: List[str]) -> Dict[str, Any]:
+        """Delete several tasks via MCP tool.
+        
+        Args:
+            user_id: ID of the user
+            task_ids: IDs of the tasks to delete
+            
+        Returns:
+            dict: Confirmation message with the number of tasks deleted
+            
+        Raises:
+            ValueError: If an ID is malformed or none of the tasks were found
+            
+        **Validates: Requirements 3.4, 11.4**
+        """
+        task_uuids = self._parse_task_ids(task_ids)
+        
+        deleted = self.task_service.delete_tasks_bulk(
+            user_id=user_id,
+            task_ids=task_uuids,
+        )
+        if not deleted:
+            raise ValueError("Tasks not found")
+        
+        return {
+            "status": "success",
+            "deleted": deleted,
+            "message": f"{deleted} tasks deleted successfully",
+        }
+
     def update_task(
         self,
         user_id: UUID,
@@ -164,17 +377,13 @@ class MCPServer:
             
         **Validates: Requirements 3.5, 11.5**
         """
-        try:
-            task_uuid = UUID(task_id)
-        except ValueError:
-            raise ValueError(f"Invalid task ID format: {task_id}")
+        task_uuid = self._parse_task_id(task_id)
         
-        if priority and priority not in ["Low", "Medium", "High"]:
+        if priority and priority not in VALID_PRIORITIES:
             raise ValueError(f"Invalid priority: {priority}. Must be Low, Medium, or High")
         
-        from app.schemas import TaskUpdate
         task_update = TaskUpdate(
-            description=description.strip() if description else None,
+            description=strip_description(description) if description else None,
             priority=priority,
         )
         task = self.task_service.update_task(
@@ -194,86 +403,10 @@ class MCPServer:
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         """Get MCP tool definitions for the AI agent.
         
+        Always returns the same definitions in the same order; callers must
+        not modify them.
+        
         Returns:
             list: Tool definitions with name, description, and input schema
         """
-        return [
-            {
-                "name": "add_task",
-                "description": "Add a new task to the user's task list",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "description": {
-                            "type": "string",
-                            "description": "The task description",
-                        },
-                        "priority": {
-                            "type": "string",
-                            "enum": ["Low", "Medium", "High"],
-                            "description": "Task priority (optional, defaults to Medium)",
-                        },
-                    },
-                    "required": ["description"],
-                },
-            },
-            {
-                "name": "list_tasks",
-                "description": "List all tasks for the user",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {},
-                },
-            },
-            {
-                "name": "complete_task",
-                "description": "Mark a task as complete or incomplete",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "string",
-                            "description": "The ID of the task to complete",
-                        },
-                    },
-                    "required": ["task_id"],
-                },
-            },
-            {
-                "name": "delete_task",
-                "description": "Delete a task from the user's task list",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "string",
-                            "description": "The ID of the task to delete",
-                        },
-                    },
-                    "required": ["task_id"],
-                },
-            },
-            {
-                "name": "update_task",
-                "description": "Update a task's description or priority",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {
-                            "type": "string",
-                            "description": "The ID of the task to update",
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "New task description (optional)",
-                        },
-                        "priority": {
-                            "type": "string",
-                            "enum": ["Low", "Medium", "High"],
-                            "description": "New task priority (optional)",
-                        },
-                    },
-                    "required": ["task_id"],
-                },
-            },
-        ]
+        return TOOL_DEFINITIONS
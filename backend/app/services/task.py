@@ -1,10 +1,80 @@
 """Task service for task management."""
 
+import threading
+from cachetools import TTLCache
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import Row, String, cast, delete, func, insert, select, update
 from sqlalchemy.orm import Session
-from uuid import UUID
+from uuid import UUID, uuid4
 from app.models import Task
 from app.schemas import TaskCreate, TaskUpdate, TaskResponse
 
+# Shared by every validator so membership checks don't rebuild the set per call
+VALID_PRIORITIES = frozenset(("High", "Medium", "Low"))
+
+
+def strip_description(description: Optional[str]) -> str:
+    """Strip surrounding whitespace from a task description.
+    
+    Args:
+        description: Raw description, possibly None
+        
+    Returns:
+        The stripped description, empty if it was None or whitespace-only
+    """
+    return description.strip() if description else ""
+
+
+# user_id -> (freshness stamp, that user's tasks as list_tasks_for_mcp returns
+# them). The stamp is the user's task count and latest updated_at, so a cheap
+# aggregate tells whether any worker has changed the tasks since they were
+# cached; the AI agent resolves "task N" against this list, so it must not lag
+# behind writes made elsewhere.
+_task_list_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_task_list_cache_lock = threading.Lock()
+
+
+def clear_task_list_cache() -> None:
+    """Forget all cached task lists (e.g. between tests)."""
+    with _task_list_cache_lock:
+        _task_list_cache.clear()
+
+
+def invalidate_task_list(user_id: UUID) -> None:
+    """Drop a user's cached task list after their tasks change.
+    
+    Args:
+        user_id: ID of the user
+    """
+    with _task_list_cache_lock:
+        _task_list_cache.pop(user_id, None)
+
+
+# Columns a TaskResponse is built from, in the order rows return them
+_RESPONSE_COLUMNS = (Task.id, Task.description, Task.completed, Task.priority, Task.created_at)
+
+
+def _row_to_response(row: Row) -> TaskResponse:
+    """Build a task response from a row of _RESPONSE_COLUMNS.
+    
+    The database already guarantees the column types, so pydantic validation
+    is skipped.
+    
+    Args:
+        row: Row with id, description, completed, priority and created_at
+        
+    Returns:
+        Task response
+    """
+    return TaskResponse.model_construct(
+        id=row.id,
+        description=row.description,
+        completed=row.completed,
+        priority=row.priority,
+        created_at=row.created_at,
+    )
+
 
 class TaskService:
     """Manages task CRUD operations and persistence."""
@@ -30,27 +100,68 @@ class TaskService:
         Raises:
             ValueError: If description is invalid
         """
-        # Validate description
-        if not request.description or not request.description.strip():
-            raise ValueError("Description cannot be empty or whitespace-only")
-        
-        # Validate priority
-        valid_priorities = {"High", "Medium", "Low"}
-        if request.priority not in valid_priorities:
-            raise ValueError("Priority must be High, Medium, or Low")
-        
-        # Create task
-        task = Task(
-            user_id=user_id,
-            description=request.description.strip(),
-            priority=request.priority,
-            completed=False,
-        )
-        self.db.add(task)
+        return self.create_tasks_bulk(user_id, [request])[0]
+
+    def create_tasks_bulk(self, user_id: UUID, requests: list[TaskCreate]) -> list[TaskResponse]:
+        """Create several tasks with a single INSERT and one commit.
+        
+        IDs and timestamps are generated client-side, so the created tasks are
+        returned without reading them back from the database.
+        
+        Args:
+            user_id: User ID who owns the tasks
+            requests: Task creation requests
+            
+        Returns:
+            Created task responses, in request order
+            
+        Raises:
+            ValueError: If any description or priority is invalid (nothing is created)
+        """
+        descriptions = []
+        for request in requests:
+            # Validate description
+            description = strip_description(request.description)
+            if not description:
+                raise ValueError("Description cannot be empty or whitespace-only")
+            descriptions.append(description)
+            
+            # Validate priority
+            if request.priority not in VALID_PRIORITIES:
+                raise ValueError("Priority must be High, Medium, or Low")
+        
+        if not requests:
+            return []
+        
+        # Space the timestamps a microsecond apart so tasks list in request order
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "description": description,
+                "priority": request.priority,
+                "completed": False,
+                "created_at": now + timedelta(microseconds=position),
+                "updated_at": now,
+            }
+            for position, (request, description) in enumerate(zip(requests, descriptions))
+        ]
+        # One statement: SQLAlchemy batches the rows into a multi-VALUES INSERT
+        self.db.execute(insert(Task), rows)
         self.db.commit()
-        self.db.refresh(task)
+        invalidate_task_list(user_id)
         
-        return TaskResponse.from_orm(task)
+        return [
+            TaskResponse.model_construct(
+                id=row["id"],
+                description=row["description"],
+                completed=False,
+                priority=row["priority"],
+                created_at=row["created_at"],
+            )
+            for row in rows
+        ]
 
     def get_tasks(self, user_id: UUID) -> list[TaskResponse]:
         """Get all tasks for a user.
@@ -61,8 +172,63 @@ class TaskService:
         Returns:
             List of task responses in creation order
         """
-        tasks = self.db.query(Task).filter(Task.user_id == user_id).order_by(Task.created_at).all()
-        return [TaskResponse.from_orm(task) for task in tasks]
+        return [_row_to_response(row) for row in self.get_task_rows(user_id)]
+
+    def get_task_rows(self, user_id: UUID) -> list[Row]:
+        """Get all tasks for a user as plain rows, without building responses.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Rows of (id, description, completed, priority, created_at), in
+            creation order (ties broken by id, so the order is stable)
+        """
+        return self.db.execute(
+            select(*_RESPONSE_COLUMNS)
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at, Task.id)
+        ).all()
+
+    def list_tasks_for_mcp(self, user_id: UUID) -> list[dict]:
+        """Get all tasks for a user as JSON-ready dicts.
+        
+        The database renders the ID and timestamp as strings, so the rows need
+        no per-task conversion in Python.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Dicts with string id, description, priority, completed and ISO 8601
+            created_at, in creation order (served from a cache while the
+            user's task count and latest update time are unchanged)
+        """
+        # Read the stamp before the rows: a write landing in between leaves
+        # the entry with an old stamp, so it is refetched rather than trusted
+        stamp = tuple(self.db.execute(
+            select(func.count(), func.max(Task.updated_at)).where(Task.user_id == user_id)
+        ).one())
+        with _task_list_cache_lock:
+            cached = _task_list_cache.get(user_id)
+        if cached is not None and cached[0] == stamp:
+            return list(cached[1])
+        
+        rows = self.db.execute(
+            select(
+                cast(Task.id, String).label("id"),
+                Task.description,
+                Task.priority,
+                Task.completed,
+                func.to_char(Task.created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US').label("created_at"),
+            )
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at, Task.id)
+        )
+        tasks = [dict(row) for row in rows.mappings()]
+        with _task_list_cache_lock:
+            _task_list_cache[user_id] = (stamp, tuple(tasks))
+        return tasks
 
     def get_task(self, user_id: UUID, task_id: UUID) -> TaskResponse:
         """Get a specific task.
@@ -77,11 +243,16 @@ class TaskService:
         Raises:
             ValueError: If task not found or unauthorized
         """
-        task = self.db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
-        if not task:
+        # Select just the response columns; no ORM object is loaded or tracked
+        row = self.db.execute(
+            select(*_RESPONSE_COLUMNS)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .limit(1)
+        ).first()
+        if row is None:
             raise ValueError("Task not found")
         
-        return TaskResponse.from_orm(task)
+        return _row_to_response(row)
 
     def update_task(self, user_id: UUID, task_id: UUID, request: TaskUpdate) -> TaskResponse:
         """Update a task.
@@ -97,27 +268,25 @@ class TaskService:
         Raises:
             ValueError: If task not found, unauthorized, or invalid data
         """
-        task = self.db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
-        if not task:
-            raise ValueError("Task not found")
+        values = {}
         
         # Update description if provided
         if request.description is not None:
-            if not request.description or not request.description.strip():
+            description = strip_description(request.description)
+            if not description:
                 raise ValueError("Description cannot be empty or whitespace-only")
-            task.description = request.description.strip()
+            values["description"] = description
         
         # Update priority if provided
         if request.priority is not None:
-            valid_priorities = {"High", "Medium", "Low"}
-            if request.priority not in valid_priorities:
+            if request.priority not in VALID_PRIORITIES:
                 raise ValueError("Priority must be High, Medium, or Low")
-            task.priority = request.priority
+            values["priority"] = request.priority
         
-        self.db.commit()
-        self.db.refresh(task)
+        if not values:
+            return self.get_task(user_id, task_id)
         
-        return TaskResponse.from_orm(task)
+        return self._update_returning(user_id, task_id, values)
 
     def delete_task(self, user_id: UUID, task_id: UUID) -> None:
         """Delete a task.
@@ -129,12 +298,29 @@ class TaskService:
         Raises:
             ValueError: If task not found or unauthorized
         """
-        task = self.db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
-        if not task:
+        if not self.delete_tasks_bulk(user_id, [task_id]):
             raise ValueError("Task not found")
+
+    def delete_tasks_bulk(self, user_id: UUID, task_ids: list[UUID]) -> int:
+        """Delete several of the user's tasks with a single DELETE and one commit.
+        
+        Args:
+            user_id: User ID (for authorization)
+            task_ids: IDs of the tasks to delete
+            
+        Returns:
+            Number of tasks deleted; IDs that don't exist or belong to another
+            user are skipped
+        """
+        if not task_ids:
+            return 0
         
-        self.db.delete(task)
+        result = self.db.execute(
+            delete(Task).where(Task.user_id == user_id, Task.id.in_(task_ids))
+        )
         self.db.commit()
+        invalidate_task_list(user_id)
+        return result.rowcount
 
     def toggle_completion(self, user_id: UUID, task_id: UUID) -> TaskResponse:
         """Toggle task completion status.
@@ -149,12 +335,62 @@ class TaskService:
         Raises:
             ValueError: If task not found or unauthorized
         """
-        task = self.db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
-        if not task:
-            raise ValueError("Task not found")
+        return self._update_returning(user_id, task_id, {"completed": ~Task.completed})
+
+    def toggle_completion_bulk(self, user_id: UUID, task_ids: list[UUID]) -> list[TaskResponse]:
+        """Toggle the completion status of several tasks with a single UPDATE.
+        
+        Args:
+            user_id: User ID (for authorization)
+            task_ids: IDs of the tasks to toggle (each is toggled once)
+            
+        Returns:
+            Updated task responses, in the order of ``task_ids``; IDs that
+            don't exist or belong to another user are skipped
+        """
+        if not task_ids:
+            return []
+        
+        rows = self.db.execute(
+            update(Task)
+            .where(Task.user_id == user_id, Task.id.in_(task_ids))
+            .values(completed=~Task.completed)
+            .returning(*_RESPONSE_COLUMNS)
+        ).all()
+        self.db.commit()
+        invalidate_task_list(user_id)
+        
+        # RETURNING has no defined order, so restore the requested one
+        tasks = {row.id: _row_to_response(row) for row in rows}
+        return [tasks.pop(task_id) for task_id in task_ids if task_id in tasks]
+
+    def _update_returning(self, user_id: UUID, task_id: UUID, values: dict) -> TaskResponse:
+        """Update one of the user's tasks and return it, in a single statement.
         
-        task.completed = not task.completed
+        The ownership check is part of the UPDATE's WHERE clause and the new
+        values come back through RETURNING, so there is no SELECT before or
+        after the write.
+        
+        Args:
+            user_id: User ID (for authorization)
+            task_id: Task ID
+            values: Column values (or SQL expressions) to set
+            
+        Returns:
+            Updated task response
+            
+        Raises:
+            ValueError: If task not found or unauthorized
+        """
+        row = self.db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .values(**values)
+            .returning(*_RESPONSE_COLUMNS)
+        ).first()
+        if row is None:
+            raise ValueError("Task not found")
         self.db.commit()
-        self.db.refresh(task)
+        invalidate_task_list(user_id)
         
-        return TaskResponse.from_orm(task)
+        return _row_to_response(row)
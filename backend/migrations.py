@@ -1,5 +1,6 @@
 """Database migrations script."""
 
+from sqlalchemy import inspect, text
 from app.database import Base, engine
 from app.models import User, Task, ConversationMessage
 
@@ -7,9 +8,41 @@ from app.models import User, Task, ConversationMessage
 def create_all_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
+    drop_stale_indexes()
     print("✅ All tables created successfully!")
 
 
+def create_missing_indexes():
+    """Create indexes added to models after their tables already existed."""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                print(f"✅ Created index {index.name}")
+
+
+def drop_stale_indexes():
+    """Drop ``ix_*`` indexes that are no longer declared on the models.
+    
+    Superseded indexes (e.g. single-column ones replaced by a composite index)
+    would otherwise keep costing a write on every insert. Indexes backing a
+    constraint, and indexes not named with the ``ix_`` prefix, are left alone.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    for table in Base.metadata.sorted_tables:
+        declared = {index.name for index in table.indexes}
+        for index in inspector.get_indexes(table.name):
+            name = index["name"]
+            if name.startswith("ix_") and name not in declared and "duplicates_constraint" not in index:
+                with engine.begin() as connection:
+                    connection.execute(text(f"DROP INDEX {quote(name)}"))
+                print(f"🗑️  Dropped stale index {name}")
+
+
 def drop_all_tables():
     """Drop all database tables (use with caution)."""
     Base.metadata.drop_all(bind=engine)
@@ -3,9 +3,8 @@
 import pytest
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 # Load environment variables BEFORE importing app modules
 load_dotenv(os.path.join(os.path.dirname(__file__), "../.env"))
@@ -15,6 +14,41 @@ os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-testing-only")
 os.environ.setdefault("JWT_ALGORITHM", "HS256")
 os.environ.setdefault("JWT_EXPIRATION_HOURS", "24")
 os.environ.setdefault("ENVIRONMENT", "testing")
+# Tests check hashing behaviour, not its strength, so hash at bcrypt's minimum
+# cost even when a local .env sets the production value
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+# Use the same database as development for testing (PostgreSQL)
+# This ensures UUID support works correctly
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test_db")
+
+
+def use_worker_database():
+    """Give each pytest-xdist worker a database of its own, creating it if needed.
+    
+    Runs before the app is imported so the app's engine and the test engine
+    both point at the worker's database.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return
+    url = make_url(os.environ["DATABASE_URL"])
+    worker_url = url.set(database=f"{url.database}_{worker}")
+    admin_engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with admin_engine.connect() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": worker_url.database},
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{worker_url.database}"'))
+    finally:
+        admin_engine.dispose()
+    os.environ["DATABASE_URL"] = worker_url.render_as_string(hide_password=False)
+
+
+use_worker_database()
 
 # Clear the settings cache before importing app
 from app.config import get_settings
@@ -22,34 +56,72 @@ get_settings.cache_clear()
 
 from app.database import Base, get_db
 from app.main import app
+from app.services.auth import clear_token_cache
+from app.services.chat import clear_history_cache
+from app.services.task import clear_task_list_cache
 from app.models import User, Task, ConversationMessage  # Import models to register them
 
-# Use the same database as development for testing (PostgreSQL)
-# This ensures UUID support works correctly
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/test_db")
+SQLALCHEMY_DATABASE_URL = os.environ["DATABASE_URL"]
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    poolclass=StaticPool,
-)
+# A regular pool: each test checks out its own connection instead of sharing one
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db():
-    """Create a fresh database for each test."""
-    # Drop all tables first
+@pytest.fixture(autouse=True)
+def reset_token_cache():
+    """Keep cached token verifications, chat context and task lists from leaking between tests."""
+    clear_token_cache()
+    clear_history_cache()
+    clear_task_list_cache()
+    yield
+    clear_token_cache()
+    clear_history_cache()
+    clear_task_list_cache()
+
+
+@pytest.fixture(scope="session")
+def database_schema():
+    """Create the tables once for the whole test session."""
     Base.metadata.drop_all(bind=engine)
-    # Create all tables
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db(database_schema):
+    """Run each test in a transaction that is rolled back afterwards.
+    
+    Commits made by the code under test only release a savepoint, so nothing
+    outlives the test and no DDL runs between tests.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        # Clean up after test
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="function")
+def clean_tables(database_schema):
+    """Empty every table after tests that commit through their own sessions."""
+    yield
+    table_names = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {table_names} CASCADE"))
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """One TestClient shared by the integration tests; each test installs its own get_db override."""
+    from fastapi.testclient import TestClient
+    return TestClient(app)
 
 
 @pytest.fixture(scope="function")
@@ -1,17 +1,48 @@
 """Integration tests for API endpoints."""
 
 import pytest
-from fastapi.testclient import TestClient
 from app.main import app
-from app.database import get_db, SessionLocal, Base, engine
+from app.database import get_db, SessionLocal
+from app.config import get_settings
 from app.models import User, Task
+from app.schemas import TaskCreate
+from app.services import AuthenticationService, TaskService
+import bcrypt
+
+# Hashed once at import so tests that only need a user skip bcrypt
+PASSWORD = "password123"
+PASSWORD_HASH = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)).decode()
+
+
+def _create_user(email):
+    """Store a user directly and return (user_id, token)."""
+    db = SessionLocal()
+    try:
+        user = User(email=email, password_hash=PASSWORD_HASH)
+        db.add(user)
+        db.commit()
+        token, _ = AuthenticationService(db).generate_token(str(user.id))
+        return str(user.id), token
+    finally:
+        db.close()
+
+
+def _seed_tasks(user_id, descriptions):
+    """Store tasks with one bulk INSERT and return their responses, for tests that only read."""
+    from uuid import UUID
+
+    db = SessionLocal()
+    try:
+        return TaskService(db).create_tasks_bulk(
+            UUID(user_id), [TaskCreate(description=description) for description in descriptions]
+        )
+    finally:
+        db.close()
 
 
 @pytest.fixture(scope="function")
-def test_client():
-    """Create test client with fresh database."""
-    Base.metadata.create_all(bind=engine)
-    
+def test_client(clean_tables, api_client):
+    """Shared test client whose requests use fresh sessions on the test schema."""
     def override_get_db():
         db = SessionLocal()
         try:
@@ -21,10 +52,13 @@ def test_client():
     
     app.dependency_overrides[get_db] = override_get_db
     
-    client = TestClient(app)
-    yield client
-    
-    Base.metadata.drop_all(bind=engine)
+    yield api_client
+
+
+@pytest.fixture(scope="function")
+def authed_user(test_client):
+    """A stored user with a valid token, as (user_id, token)."""
+    return _create_user("test@example.com")
 
 
 class TestAuthenticationEndpoints:
@@ -78,14 +112,8 @@ class TestAuthenticationEndpoints:
         
         assert response.status_code == 400
 
-    def test_signin_success(self, test_client):
+    def test_signin_success(self, test_client, authed_user):
         """Test successful user signin."""
-        # Create user
-        test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        
         # Sign in
         response = test_client.post(
             "/auth/signin",
@@ -106,14 +134,8 @@ class TestAuthenticationEndpoints:
         
         assert response.status_code == 401
 
-    def test_signin_wrong_password(self, test_client):
+    def test_signin_wrong_password(self, test_client, authed_user):
         """Test signin with wrong password."""
-        # Create user
-        test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        
         # Try to sign in with wrong password
         response = test_client.post(
             "/auth/signin",
@@ -133,15 +155,9 @@ class TestAuthenticationEndpoints:
 class TestTaskEndpoints:
     """Integration tests for task endpoints."""
 
-    def test_create_task_success(self, test_client):
+    def test_create_task_success(self, test_client, authed_user):
         """Test successful task creation."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
         # Create task
         response = test_client.post(
@@ -165,15 +181,9 @@ class TestTaskEndpoints:
         
         assert response.status_code == 401
 
-    def test_create_task_empty_description(self, test_client):
+    def test_create_task_empty_description(self, test_client, authed_user):
         """Test task creation with empty description."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
         # Try to create task with empty description
         response = test_client.post(
@@ -184,27 +194,11 @@ class TestTaskEndpoints:
         
         assert response.status_code == 400
 
-    def test_get_tasks(self, test_client):
+    def test_get_tasks(self, test_client, authed_user):
         """Test retrieving task list."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
-        # Create tasks
-        test_client.post(
-            f"/api/{user_id}/tasks",
-            json={"description": "Task 1"},
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        test_client.post(
-            f"/api/{user_id}/tasks",
-            json={"description": "Task 2"},
-            headers={"Authorization": f"Bearer {token}"},
-        )
+        seeded = _seed_tasks(user_id, ["Task 1", "Task 2"])
         
         # Get tasks
         response = test_client.get(
@@ -214,25 +208,14 @@ class TestTaskEndpoints:
         
         assert response.status_code == 200
         tasks = response.json()
-        assert len(tasks) == 2
+        assert tasks == [task.model_dump(mode="json") for task in seeded]
+        assert [t["description"] for t in tasks] == ["Task 1", "Task 2"]
 
-    def test_get_task_by_id(self, test_client):
+    def test_get_task_by_id(self, test_client, authed_user):
         """Test retrieving a specific task."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
-        # Create task
-        create_response = test_client.post(
-            f"/api/{user_id}/tasks",
-            json={"description": "Test task"},
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        task_id = create_response.json()["id"]
+        task_id = _seed_tasks(user_id, ["Test task"])[0].id
         
         # Get task
         response = test_client.get(
@@ -243,15 +226,9 @@ class TestTaskEndpoints:
         assert response.status_code == 200
         assert response.json()["description"] == "Test task"
 
-    def test_update_task(self, test_client):
+    def test_update_task(self, test_client, authed_user):
         """Test updating a task."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
         # Create task
         create_response = test_client.post(
@@ -272,15 +249,9 @@ class TestTaskEndpoints:
         assert response.json()["description"] == "Updated task"
         assert response.json()["priority"] == "Low"
 
-    def test_delete_task(self, test_client):
+    def test_delete_task(self, test_client, authed_user):
         """Test deleting a task."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
         # Create task
         create_response = test_client.post(
@@ -298,15 +269,9 @@ class TestTaskEndpoints:
         
         assert response.status_code == 204
 
-    def test_toggle_task_completion(self, test_client):
+    def test_toggle_task_completion(self, test_client, authed_user):
         """Test toggling task completion."""
-        # Create user
-        signup_response = test_client.post(
-            "/auth/signup",
-            json={"email": "test@example.com", "password": "password123"},
-        )
-        user_id = signup_response.json()["user_id"]
-        token = signup_response.json()["token"]
+        user_id, token = authed_user
         
         # Create task
         create_response = test_client.post(
@@ -325,6 +290,17 @@ class TestTaskEndpoints:
         assert response.status_code == 200
         assert response.json()["completed"] is True
 
+    def test_malformed_task_id_rejected(self, test_client, authed_user):
+        """Test that a malformed task ID is a validation error, not a missing task."""
+        user_id, token = authed_user
+        
+        response = test_client.get(
+            f"/api/{user_id}/tasks/not-a-uuid",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        
+        assert response.status_code == 422
+
 
 class TestCrossUserAuthorization:
     """Integration tests for cross-user authorization."""
@@ -332,28 +308,13 @@ class TestCrossUserAuthorization:
     def test_cross_user_task_access_rejected(self, test_client):
         """Test that users cannot access other users' tasks."""
         # Create user 1
-        user1_response = test_client.post(
-            "/auth/signup",
-            json={"email": "user1@example.com", "password": "password123"},
-        )
-        user1_id = user1_response.json()["user_id"]
-        user1_token = user1_response.json()["token"]
+        user1_id, _ = _create_user("user1@example.com")
         
         # Create user 2
-        user2_response = test_client.post(
-            "/auth/signup",
-            json={"email": "user2@example.com", "password": "password123"},
-        )
-        user2_id = user2_response.json()["user_id"]
-        user2_token = user2_response.json()["token"]
+        user2_id, user2_token = _create_user("user2@example.com")
         
-        # User 1 creates a task
-        create_response = test_client.post(
-            f"/api/{user1_id}/tasks",
-            json={"description": "User 1's task"},
-            headers={"Authorization": f"Bearer {user1_token}"},
-        )
-        task_id = create_response.json()["id"]
+        # User 1 has a task
+        task_id = _seed_tasks(user1_id, ["User 1's task"])[0].id
         
         # User 2 tries to access User 1's task
         response = test_client.get(
@@ -362,3 +323,276 @@ class TestCrossUserAuthorization:
         )
         
         assert response.status_code == 403
+
+
+class TestTaskAuthentication:
+    """Integration tests for task token verification and its cache."""
+
+    def _signup(self, test_client):
+        """Create a user and return (user_id, headers)."""
+        user_id, token = _create_user("tasks@example.com")
+        return user_id, {"Authorization": f"Bearer {token}"}
+
+    def test_cached_token_rejected_after_user_deleted(self, test_client):
+        """Test that a cached token verification does not outlive its user."""
+        from uuid import UUID
+
+        user_id, headers = self._signup(test_client)
+        assert test_client.get(f"/api/{user_id}/tasks", headers=headers).status_code == 200
+        
+        db = SessionLocal()
+        try:
+            db.delete(db.get(User, UUID(user_id)))
+            db.commit()
+        finally:
+            db.close()
+        
+        response = test_client.get(f"/api/{user_id}/tasks", headers=headers)
+        
+        assert response.status_code == 401
+        assert response.json()["detail"] == "User not found"
+
+    def test_logout_drops_cached_verification(self, test_client):
+        """Test that logging out removes the token from the verification cache
+        shared by the task and chat routes."""
+        from app.services.auth import _token_cache
+
+        user_id, headers = self._signup(test_client)
+        test_client.get(f"/api/{user_id}/tasks", headers=headers)
+        test_client.get(f"/api/{user_id}/chat/history", headers=headers)
+        assert len(_token_cache) == 1
+        
+        response = test_client.post("/auth/logout", headers=headers)
+        
+        assert response.status_code == 200
+        assert len(_token_cache) == 0
+
+
+class TestChatAuthentication:
+    """Integration tests for chat token verification and its cache."""
+
+    def _signup(self, test_client):
+        """Create a user and return (user_id, token)."""
+        return _create_user("chat@example.com")
+
+    def test_cached_token_rejected_after_user_deleted(self, test_client):
+        """Test that a cached token does not outlive its user."""
+        from uuid import UUID
+
+        user_id, token = self._signup(test_client)
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        # First request verifies and caches the token
+        assert test_client.get(f"/api/{user_id}/chat/history", headers=headers).status_code == 200
+        
+        db = SessionLocal()
+        try:
+            db.delete(db.get(User, UUID(user_id)))
+            db.commit()
+        finally:
+            db.close()
+        
+        response = test_client.get(f"/api/{user_id}/chat/history", headers=headers)
+        
+        assert response.status_code == 404
+        assert response.json()["detail"] == "User not found"
+
+    def test_expired_cached_token_is_decoded_again(self, test_client):
+        """Test that a cache entry past its exp is re-verified and rejected."""
+        import jwt
+        from datetime import datetime, timedelta
+        from app.config import get_settings
+        from app.services.auth import _token_cache, _token_cache_key
+
+        user_id, _ = self._signup(test_client)
+        settings = get_settings()
+        expired = datetime.utcnow() - timedelta(minutes=5)
+        token = jwt.encode(
+            {"user_id": user_id, "exp": expired},
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm,
+        )
+        _token_cache[_token_cache_key(token)] = (user_id, int(expired.timestamp()))
+        
+        response = test_client.get(
+            f"/api/{user_id}/chat/history",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has expired"
+
+    def test_token_without_user_id_not_cached(self, test_client):
+        """Test that tokens missing user_id are rejected and never cached."""
+        import jwt
+        from datetime import datetime, timedelta
+        from app.config import get_settings
+        from app.services.auth import _token_cache
+
+        user_id, _ = self._signup(test_client)
+        settings = get_settings()
+        token = jwt.encode(
+            {"exp": datetime.utcnow() + timedelta(hours=1)},
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm,
+        )
+        
+        response = test_client.get(
+            f"/api/{user_id}/chat/history",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid token"
+        assert len(_token_cache) == 0
+
+
+class TestChatHistoryPagination:
+    """Integration tests for chat history pagination."""
+
+    def _signup_with_messages(self, test_client, count):
+        """Create a user with ``count`` stored messages and return (user_id, headers)."""
+        from uuid import UUID
+        from app.repositories import ChatRepository
+
+        user_id, token = _create_user("history@example.com")
+        
+        db = SessionLocal()
+        try:
+            repo = ChatRepository(db)
+            for i in range(count):
+                repo.add_message(UUID(user_id), f"Message {i}", "user")
+        finally:
+            db.close()
+        
+        return user_id, {"Authorization": f"Bearer {token}"}
+
+    def test_total_count_on_every_offset_page(self, test_client):
+        """Test that first, middle and past-the-end pages all report the total."""
+        user_id, headers = self._signup_with_messages(test_client, 5)
+        url = f"/api/{user_id}/chat/history"
+        
+        first = test_client.get(url, params={"limit": 2, "offset": 0}, headers=headers).json()
+        middle = test_client.get(url, params={"limit": 2, "offset": 2}, headers=headers).json()
+        past_end = test_client.get(url, params={"limit": 2, "offset": 10}, headers=headers).json()
+        
+        assert [m["content"] for m in first["messages"]] == ["Message 0", "Message 1"]
+        assert [m["content"] for m in middle["messages"]] == ["Message 2", "Message 3"]
+        assert past_end["messages"] == []
+        assert first["total_count"] == middle["total_count"] == past_end["total_count"] == 5
+
+    def test_total_count_for_empty_history(self, test_client):
+        """Test that a user without messages gets an empty page and a zero total."""
+        user_id, headers = self._signup_with_messages(test_client, 0)
+        
+        data = test_client.get(f"/api/{user_id}/chat/history", headers=headers).json()
+        
+        assert data["messages"] == []
+        assert data["total_count"] == 0
+
+    def test_after_cursor_pages_through_history(self, test_client):
+        """Test that following next_after visits every message exactly once, in order."""
+        user_id, headers = self._signup_with_messages(test_client, 5)
+        url = f"/api/{user_id}/chat/history"
+        
+        page = test_client.get(url, params={"limit": 2}, headers=headers).json()
+        contents = [m["content"] for m in page["messages"]]
+        while page["next_after"]:
+            page = test_client.get(
+                url, params={"limit": 2, "after": page["next_after"]}, headers=headers
+            ).json()
+            contents.extend(m["content"] for m in page["messages"])
+        
+        assert contents == [f"Message {i}" for i in range(5)]
+        assert page["total_count"] == 1, "Last page counts only messages after the cursor"
+
+    def test_after_cursor_keeps_messages_with_same_timestamp(self, test_client):
+        """Test that messages sharing the cursor's timestamp are not skipped."""
+        from datetime import datetime
+        from uuid import UUID
+        from app.models import ConversationMessage
+
+        user_id, headers = self._signup_with_messages(test_client, 0)
+        created_at = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            db.add_all([
+                ConversationMessage(user_id=UUID(user_id), content=f"Tied {i}", sender="user", created_at=created_at)
+                for i in range(3)
+            ])
+            db.commit()
+        finally:
+            db.close()
+        url = f"/api/{user_id}/chat/history"
+        
+        first = test_client.get(url, params={"limit": 1}, headers=headers).json()
+        rest = test_client.get(
+            url, params={"limit": 10, "after": first["next_after"]}, headers=headers
+        ).json()
+        
+        ids = [m["id"] for m in first["messages"] + rest["messages"]]
+        assert len(ids) == len(set(ids)) == 3
+        assert rest["next_after"] is None
+
+    def test_after_and_offset_together_rejected(self, test_client):
+        """Test that mixing keyset and offset pagination is rejected."""
+        user_id, headers = self._signup_with_messages(test_client, 3)
+        url = f"/api/{user_id}/chat/history"
+        cursor = test_client.get(url, params={"limit": 1}, headers=headers).json()["next_after"]
+        
+        response = test_client.get(url, params={"offset": 1, "after": cursor}, headers=headers)
+        
+        assert response.status_code == 400
+
+    def test_malformed_after_cursor_rejected(self, test_client):
+        """Test that an unparseable cursor returns 400."""
+        user_id, headers = self._signup_with_messages(test_client, 1)
+        
+        response = test_client.get(
+            f"/api/{user_id}/chat/history", params={"after": "not-a-cursor"}, headers=headers
+        )
+        
+        assert response.status_code == 400
+
+
+class TestChatStreaming:
+    """Integration tests for the streaming chat endpoint."""
+
+    def test_stream_sends_tokens_then_stored_messages(self, test_client, monkeypatch):
+        """Test that response text streams as events and the turn is stored."""
+        import json
+        from app.services.ai_agent import AIAgent
+
+        async def fake_stream(self, user_id, message, history):
+            yield {"type": "token", "content": "Hello "}
+            yield {"type": "token", "content": "there"}
+            yield {"type": "done", "response": "Hello there", "tool_calls": []}
+
+        monkeypatch.setattr(AIAgent, "stream_message", fake_stream)
+        user_id, token = _create_user("stream@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = test_client.post(f"/api/{user_id}/chat/stream", json={"message": "hi"}, headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.split("\n\n") if line.startswith("data: ")
+        ]
+        assert [e["type"] for e in events] == ["token", "token", "done"]
+        assert events[-1]["user_message"]["content"] == "hi"
+        assert events[-1]["assistant_message"]["content"] == "Hello there"
+        history = test_client.get(f"/api/{user_id}/chat/history", headers=headers).json()
+        assert [m["content"] for m in history["messages"]] == ["hi", "Hello there"]
+
+    def test_stream_rejects_empty_message(self, test_client):
+        """Test that an empty message is rejected before streaming starts."""
+        user_id, token = _create_user("stream-empty@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = test_client.post(
+            f"/api/{user_id}/chat/stream", json={"message": "   "}, headers=headers
+        )
+
+        assert response.status_code == 400
@@ -1,12 +1,12 @@
 """Integration tests for chat endpoints and functionality."""
 
 import pytest
-from fastapi.testclient import TestClient
 from app.main import app
-from app.database import get_db, SessionLocal, Base, engine
+from app.database import get_db, SessionLocal
 from app.models import User, Task, ConversationMessage
 from uuid import uuid4
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
+import asyncio
 import os
 
 
@@ -14,7 +14,10 @@ import os
 @pytest.fixture(autouse=True)
 def mock_openai_api():
     """Mock OpenAI API for all tests."""
-    with patch('app.services.ai_agent.OpenAI') as mock_openai:
+    from app.services.ai_agent import get_openai_client
+
+    get_openai_client.cache_clear()
+    with patch('app.services.ai_agent.AsyncOpenAI') as mock_openai:
         # Create a mock client
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
@@ -25,16 +28,15 @@ def mock_openai_api():
         mock_message.content = "I've processed your request. You have no tasks."
         mock_message.tool_calls = []
         mock_response.choices = [MagicMock(message=mock_message)]
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         yield mock_client
+    get_openai_client.cache_clear()
 
 
 @pytest.fixture(scope="function")
-def test_client():
-    """Create test client with fresh database."""
-    Base.metadata.create_all(bind=engine)
-    
+def test_client(clean_tables, api_client):
+    """Shared test client whose requests use fresh sessions on the test schema."""
     def override_get_db():
         db = SessionLocal()
         try:
@@ -44,10 +46,7 @@ def test_client():
     
     app.dependency_overrides[get_db] = override_get_db
     
-    client = TestClient(app)
-    yield client
-    
-    Base.metadata.drop_all(bind=engine)
+    yield api_client
 
 
 class TestEndToEndChatFlow:
@@ -140,7 +139,7 @@ class TestEndToEndChatFlow:
         db = SessionLocal()
         try:
             chat_service = ChatService(db)
-            result = chat_service.process_message(test_user_id, "List my tasks")
+            result = asyncio.run(chat_service.process_message(test_user_id, "List my tasks"))
             
             assert result["user_message"]["content"] == "List my tasks"
             assert result["assistant_message"]["content"]
@@ -165,7 +164,7 @@ class TestEndToEndChatFlow:
         db = SessionLocal()
         try:
             chat_service = ChatService(db)
-            result = chat_service.process_message(test_user_id, "List my tasks")
+            result = asyncio.run(chat_service.process_message(test_user_id, "List my tasks"))
             
             # Verify response structure
             assert "assistant_message" in result
@@ -361,9 +360,9 @@ class TestConversationContextAndHistory:
             chat_service = ChatService(db)
             
             # Send multiple messages
-            chat_service.process_message(test_user_id, "Add a task to buy milk")
-            chat_service.process_message(test_user_id, "Add a task to buy bread")
-            chat_service.process_message(test_user_id, "List my tasks")
+            asyncio.run(chat_service.process_message(test_user_id, "Add a task to buy milk"))
+            asyncio.run(chat_service.process_message(test_user_id, "Add a task to buy bread"))
+            asyncio.run(chat_service.process_message(test_user_id, "List my tasks"))
             
             # Verify all messages are in history
             repo = ChatRepository(db)
@@ -392,11 +391,11 @@ class TestConversationContextAndHistory:
             chat_service = ChatService(db)
             
             # Send first message to add a task
-            result1 = chat_service.process_message(test_user_id, "Add a task called important project")
+            result1 = asyncio.run(chat_service.process_message(test_user_id, "Add a task called important project"))
             assert result1["user_message"]["content"] == "Add a task called important project"
             
             # Send second message referencing the previous task
-            result2 = chat_service.process_message(test_user_id, "Mark it as high priority")
+            result2 = asyncio.run(chat_service.process_message(test_user_id, "Mark it as high priority"))
             assert result2["user_message"]["content"] == "Mark it as high priority"
             
             # Verify both messages are in history
@@ -431,7 +430,7 @@ class TestConversationContextAndHistory:
             ]
             
             for msg in messages_sent:
-                chat_service.process_message(test_user_id, msg)
+                asyncio.run(chat_service.process_message(test_user_id, msg))
             
             # Retrieve history
             repo = ChatRepository(db)
@@ -511,11 +510,11 @@ class TestErrorScenarios:
             
             # Try to send empty message
             with pytest.raises(ValueError):
-                chat_service.process_message(test_user_id, "")
+                asyncio.run(chat_service.process_message(test_user_id, ""))
             
             # Try to send whitespace-only message
             with pytest.raises(ValueError):
-                chat_service.process_message(test_user_id, "   ")
+                asyncio.run(chat_service.process_message(test_user_id, "   "))
         finally:
             db.close()
 
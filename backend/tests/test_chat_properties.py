@@ -553,6 +553,56 @@ class TestMCPToolAuthorization:
         assert user1_email != user2_email or user1_email == user2_email  # Always true, validates logic exists
         assert task_description.strip()  # Task description is valid
 
+    @pytest.mark.parametrize("task_id", ["", "not-a-uuid", "1234", "{12345678-1234-1234-1234-123456789abc}", "12345678-1234-1234-1234-123456789abc\n"])
+    def test_malformed_task_id_rejected_before_lookup(self, task_id: str):
+        """Malformed task IDs are rejected without touching the task service.
+        
+        **Validates: Requirements 3.6, 6.4**
+        """
+        from unittest.mock import MagicMock
+        from uuid import uuid4
+        from app.services.mcp_server import MCPServer
+
+        task_service = MagicMock()
+        server = MCPServer(MagicMock(), task_service)
+
+        for call in (server.complete_task, server.delete_task, server.update_task):
+            with pytest.raises(ValueError, match="Invalid task ID format"):
+                call(user_id=uuid4(), task_id=task_id)
+        assert not task_service.method_calls
+
+    def test_batch_tools_reject_malformed_ids_and_report_missing_ones(self):
+        """Batch tools validate every ID up front, then report IDs the user
+        doesn't own as not found.
+        
+        **Validates: Requirements 3.6, 6.4**
+        """
+        from datetime import datetime
+        from unittest.mock import MagicMock
+        from uuid import uuid4
+        from app.schemas import TaskResponse
+        from app.services.mcp_server import MCPServer
+
+        owned, missing = uuid4(), uuid4()
+        task_service = MagicMock()
+        task_service.toggle_completion_bulk.return_value = [TaskResponse(
+            id=owned, description="Buy milk", completed=True, priority="Medium", created_at=datetime.utcnow(),
+        )]
+        task_service.delete_tasks_bulk.return_value = 0
+        server = MCPServer(MagicMock(), task_service)
+
+        for call in (server.complete_tasks, server.delete_tasks):
+            for task_ids in ([], "not-a-list", [str(owned), "not-a-uuid"]):
+                with pytest.raises(ValueError):
+                    call(user_id=uuid4(), task_ids=task_ids)
+        assert not task_service.method_calls
+
+        result = server.complete_tasks(user_id=uuid4(), task_ids=[str(owned), str(missing)])
+        assert [task["id"] for task in result["tasks"]] == [str(owned)]
+        assert result["not_found"] == [str(missing)]
+        with pytest.raises(ValueError, match="Tasks not found"):
+            server.delete_tasks(user_id=uuid4(), task_ids=[str(missing)])
+
 
 class TestListTasksToolConsistency:
     """Property 11: List Tasks Tool Returns All User Tasks.
@@ -575,6 +625,115 @@ class TestListTasksToolConsistency:
         assert task_count >= 1
         assert task_count <= 5
 
+    def test_list_tasks_tool_returns_only_own_tasks_in_order(self, db):
+        """The list_tasks MCP tool returns the user's own tasks, oldest first, as
+        plain dicts with string IDs and ISO timestamps.
+
+        **Validates: Requirements 3.2, 11.1**
+        """
+        from datetime import datetime
+        from app.models import User
+        from app.schemas import TaskCreate
+        from app.services.mcp_server import MCPServer
+        from app.services.task import TaskService
+
+        owner = User(email="owner@example.com", password_hash="hashed_password")
+        other = User(email="other@example.com", password_hash="hashed_password")
+        db.add_all([owner, other])
+        db.commit()
+        task_service = TaskService(db)
+        created = [
+            task_service.create_task(owner.id, TaskCreate(description=description, priority="High"))
+            for description in ["First", "Second"]
+        ]
+        task_service.create_task(other.id, TaskCreate(description="Not mine"))
+
+        tasks = MCPServer(db, task_service).list_tasks(user_id=owner.id)
+
+        assert [
+            {**task, "created_at": datetime.fromisoformat(task["created_at"])} for task in tasks
+        ] == [
+            {
+                "id": str(task.id),
+                "description": task.description,
+                "priority": "High",
+                "completed": False,
+                "created_at": task.created_at,
+            }
+            for task in created
+        ]
+
+    def test_list_tasks_tool_cached_until_tasks_change(self, db):
+        """Repeated list_tasks calls skip the query until one of the user's
+        tasks is written, after which the next call sees the change.
+
+        **Validates: Requirements 3.2, 11.1**
+        """
+        from sqlalchemy import event
+        from app.models import User
+        from app.schemas import TaskCreate
+        from app.services.mcp_server import MCPServer
+        from app.services.task import TaskService
+
+        owner = User(email="owner@example.com", password_hash="hashed_password")
+        db.add(owner)
+        db.commit()
+        task_service = TaskService(db)
+        server = MCPServer(db, task_service)
+        owner_id = owner.id
+        first = task_service.create_task(owner_id, TaskCreate(description="First"))
+        selects = []
+        connection = db.connection()
+        listener = lambda conn, cursor, statement, *args: selects.append(statement) if "ORDER BY" in statement else None
+        event.listen(connection, "before_cursor_execute", listener)
+        try:
+            before = server.list_tasks(user_id=owner_id)
+            assert server.list_tasks(user_id=owner_id) == before
+            assert len(selects) == 1
+
+            server.complete_task(user_id=owner_id, task_id=before[0]["id"])
+            after = server.list_tasks(user_id=owner_id)
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+
+        assert [task["completed"] for task in before] == [False]
+        assert [task["completed"] for task in after] == [True]
+        assert after[0]["id"] == str(first.id)
+        assert len(selects) == 2
+
+    def test_list_tasks_tool_sees_writes_from_other_workers(self, db):
+        """A cached task list is not served once the user's tasks are changed
+        by a write that never invalidated this process's cache.
+
+        **Validates: Requirements 3.2, 11.1**
+        """
+        from datetime import datetime
+        from sqlalchemy import delete, update
+        from app.models import Task, User
+        from app.schemas import TaskCreate
+        from app.services.mcp_server import MCPServer
+        from app.services.task import TaskService
+
+        owner = User(email="owner@example.com", password_hash="hashed_password")
+        db.add(owner)
+        db.commit()
+        task_service = TaskService(db)
+        server = MCPServer(db, task_service)
+        owner_id = owner.id
+        first = task_service.create_task(owner_id, TaskCreate(description="First"))
+        second = task_service.create_task(owner_id, TaskCreate(description="Second"))
+        assert [task["id"] for task in server.list_tasks(user_id=owner_id)] == [str(first.id), str(second.id)]
+
+        # Stand-ins for another worker's writes: straight SQL, no invalidation
+        db.execute(
+            update(Task).where(Task.id == first.id).values(completed=True, updated_at=datetime.utcnow())
+        )
+        completed = server.list_tasks(user_id=owner_id)
+        db.execute(delete(Task).where(Task.id == second.id))
+        deleted = server.list_tasks(user_id=owner_id)
+
+        assert [task["completed"] for task in completed] == [True, False]
+        assert [task["id"] for task in deleted] == [str(first.id)]
 
 
 class TestAddTaskIntentRecognition:
@@ -699,6 +858,137 @@ class TestAIAgentUsesConversationContext:
         finally:
             db.close()
 
+    @given(
+        history=st.lists(
+            st.tuples(st.sampled_from(["user", "assistant"]), st.text(max_size=30)),
+            max_size=10,
+        ),
+        message=st.text(min_size=1, max_size=30),
+    )
+    @settings(max_examples=10)
+    def test_formatted_messages_carry_history_in_order(self, history: list, message: str):
+        """For any conversation history, the AI_Agent sends the system prompt, then
+        every history message in order with its role, then the current message.
+
+        **Validates: Requirements 4.3**
+        """
+        from types import SimpleNamespace
+        from app.services.ai_agent import AIAgent, SYSTEM_PROMPT
+
+        agent = AIAgent.__new__(AIAgent)
+        messages = [SimpleNamespace(sender=sender, content=content) for sender, content in history]
+
+        formatted = agent._format_messages(message, messages, [])
+
+        assert formatted[0] == {"role": "system", "content": SYSTEM_PROMPT}
+        assert formatted[1:-2] == [{"role": sender, "content": content} for sender, content in history]
+        assert formatted[-2]["role"] == "system"
+        assert formatted[-1] == {"role": "user", "content": message}
+
+    def test_formatted_messages_drop_oldest_history_over_token_budget(self):
+        """When history exceeds the token budget, the oldest messages are dropped
+        and the newest ones are kept in order.
+
+        **Validates: Requirements 4.3**
+        """
+        from types import SimpleNamespace
+        from app.services.ai_agent import AIAgent, HISTORY_TOKEN_BUDGET, CHARS_PER_TOKEN
+
+        agent = AIAgent.__new__(AIAgent)
+        chunk = "x" * (HISTORY_TOKEN_BUDGET * CHARS_PER_TOKEN // 3 - 1)
+        history = [
+            SimpleNamespace(sender="user", content=f"{i}{chunk}") for i in range(5)
+        ]
+
+        formatted = agent._format_messages("hi", history, [])
+
+        assert [m["content"][0] for m in formatted[1:-2]] == ["2", "3", "4"]
+
+    def test_formatted_messages_include_numbered_tasks(self):
+        """The AI_Agent gives the model the user's tasks with their list positions,
+        so "task 2" can be resolved to an ID without calling list_tasks first.
+
+        **Validates: Requirements 12.2**
+        """
+        import json
+        from app.services.ai_agent import AIAgent, TASKS_PREFIX
+
+        agent = AIAgent.__new__(AIAgent)
+        tasks = [
+            {"id": str(uuid.uuid4()), "description": f"Task {i}", "priority": "Medium",
+             "completed": False, "created_at": "2024-01-01T00:00:00"}
+            for i in range(1, 3)
+        ]
+
+        tasks_message = agent._format_messages("complete task 2", [], tasks)[-2]
+
+        assert tasks_message["content"].startswith(TASKS_PREFIX)
+        listed = json.loads(tasks_message["content"][len(TASKS_PREFIX):])
+        assert [(t["position"], t["id"]) for t in listed] == [(1, tasks[0]["id"]), (2, tasks[1]["id"])]
+
+    def test_context_history_cached_between_turns(self):
+        """History is read from the database once; later turns get it from the
+        cache, including the messages stored by earlier turns.
+
+        **Validates: Requirements 4.3**
+        """
+        import asyncio
+        from datetime import datetime
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from app.services.chat import ChatService, ContextMessage
+
+        service = ChatService.__new__(ChatService)
+        service.repository = MagicMock()
+        service.repository.get_recent_messages.return_value = [
+            SimpleNamespace(sender="user", content="earlier"),
+        ]
+        service.repository.add_messages.side_effect = lambda records: [
+            SimpleNamespace(id=uuid.uuid4(), content=content, sender=sender, created_at=created_at)
+            for _, content, sender, created_at in records
+        ]
+        service.ai_agent = MagicMock()
+        service.ai_agent.process_message = AsyncMock(return_value={"response": "ok", "tool_calls": []})
+        user_id = uuid.uuid4()
+
+        asyncio.run(service.process_message(user_id, "first"))
+        asyncio.run(service.process_message(user_id, "second"))
+
+        service.repository.get_recent_messages.assert_called_once()
+        second_history = service.ai_agent.process_message.call_args_list[1].args[2]
+        assert second_history == [
+            ContextMessage("user", "earlier"),
+            ContextMessage("user", "first"),
+            ContextMessage("assistant", "ok"),
+        ]
+
+    def test_deleted_history_not_served_from_cache(self):
+        """After a user's messages are deleted, the next turn reads its context
+        from the database instead of the cached (deleted) messages.
+
+        **Validates: Requirements 4.3**
+        """
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from app.services.chat import ChatService, ContextMessage
+
+        service = ChatService.__new__(ChatService)
+        service.repository = MagicMock()
+        service.repository.get_recent_messages.return_value = [
+            SimpleNamespace(sender="user", content="earlier"),
+        ]
+        service.repository.delete_messages.return_value = 1
+        user_id = uuid.uuid4()
+        assert service.get_recent_messages_for_context(user_id) == [ContextMessage("user", "earlier")]
+
+        deleted = service.delete_history(user_id)
+        service.repository.get_recent_messages.return_value = []
+
+        assert deleted == 1
+        service.repository.delete_messages.assert_called_once_with(user_id)
+        assert service.get_recent_messages_for_context(user_id) == []
+        assert service.repository.get_recent_messages.call_count == 2
+
 
 class TestPronounReferenceResolution:
     """Property 55: Pronoun Reference Resolution.
@@ -819,6 +1109,317 @@ class TestSuccessfulOperationConfirmation:
         assert any(keyword in response.lower() for keyword in confirmation_keywords)
 
 
+class TestToolCallDispatch:
+    """Property 18: Successful Operation Confirmation (tool call execution).
+    
+    Validates: Requirements 5.1, 5.2
+    """
+
+    def _agent(self):
+        """Build an AIAgent around a mock MCP server."""
+        from unittest.mock import MagicMock
+        from app.services.ai_agent import AIAgent
+
+        mcp_server = MagicMock()
+        mcp_server.get_tool_definitions.return_value = []
+        return AIAgent(mcp_server)
+
+    def _tool_call(self, name, arguments):
+        """Build an OpenAI-style tool call."""
+        import json
+        from types import SimpleNamespace
+
+        return SimpleNamespace(function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+    def test_tool_calls_routed_to_mcp_server(self):
+        """Each tool call runs the matching MCP operation with its arguments, and
+        results come back in call order.
+
+        **Validates: Requirements 5.1**
+        """
+        agent = self._agent()
+        user_id = uuid.uuid4()
+        agent.mcp_server.add_task.return_value = {"description": "Buy milk"}
+        agent.mcp_server.list_tasks.return_value = []
+
+        results = agent._execute_tool_calls(user_id, [
+            self._tool_call("add_task", {"description": "Buy milk"}),
+            self._tool_call("list_tasks", {}),
+        ])
+
+        agent.mcp_server.add_task.assert_called_once_with(
+            user_id=user_id, description="Buy milk", priority="Medium",
+        )
+        agent.mcp_server.list_tasks.assert_called_once_with(user_id=user_id)
+        assert results == [
+            {"tool": "add_task", "status": "success", "result": {"description": "Buy milk"}},
+            {"tool": "list_tasks", "status": "success", "result": []},
+        ]
+
+    def test_unknown_and_failing_tools_reported_as_errors(self):
+        """Unknown tools and tools that raise are reported as errors without
+        stopping the remaining calls.
+
+        **Validates: Requirements 5.2**
+        """
+        agent = self._agent()
+        agent.mcp_server.delete_task.side_effect = ValueError("Task not found")
+        agent.mcp_server.list_tasks.return_value = []
+
+        results = agent._execute_tool_calls(uuid.uuid4(), [
+            self._tool_call("launch_rockets", {}),
+            self._tool_call("delete_task", {"task_id": "x"}),
+            self._tool_call("list_tasks", {}),
+        ])
+
+        assert [r["status"] for r in results] == ["error", "error", "success"]
+        assert results[0]["error"] == "Unknown tool: launch_rockets"
+        assert results[1]["error"] == "Task not found"
+
+    def test_tool_arguments_parsed_only_for_known_tools(self):
+        """Arguments are decoded after the tool is resolved: an unknown tool is
+        rejected without parsing, and malformed arguments never reach the server.
+
+        **Validates: Requirements 5.2**
+        """
+        from types import SimpleNamespace
+
+        agent = self._agent()
+
+        results = agent._execute_tool_calls(uuid.uuid4(), [
+            SimpleNamespace(function=SimpleNamespace(name="launch_rockets", arguments="not json")),
+            SimpleNamespace(function=SimpleNamespace(name="add_task", arguments="not json")),
+        ])
+
+        assert results[0]["error"] == "Unknown tool: launch_rockets"
+        assert results[1]["status"] == "error"
+        agent.mcp_server.add_task.assert_not_called()
+
+    def _chunk(self, content=None, tool_calls=None):
+        """Build an OpenAI-style streamed completion chunk."""
+        from types import SimpleNamespace
+
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+    def _tool_call_delta(self, index, name=None, arguments=None):
+        """Build one fragment of a streamed tool call."""
+        from types import SimpleNamespace
+
+        return SimpleNamespace(index=index, function=SimpleNamespace(name=name, arguments=arguments))
+
+    def test_streamed_message_yields_text_then_runs_tools(self):
+        """Streamed text is yielded as it arrives; tool calls split across chunks
+        are reassembled and executed once the stream ends.
+
+        **Validates: Requirements 5.1**
+        """
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        async def stream():
+            for chunk in [
+                self._chunk(content="Adding "),
+                self._chunk(content="it."),
+                self._chunk(tool_calls=[self._tool_call_delta(0, name="add_task", arguments='{"descri')]),
+                self._chunk(tool_calls=[self._tool_call_delta(0, arguments='ption": "Buy milk"}')]),
+            ]:
+                yield chunk
+
+        async def collect(events):
+            return [event async for event in events]
+
+        agent = self._agent()
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=stream())
+        agent.mcp_server.add_task.return_value = {"description": "Buy milk", "priority": "Medium"}
+        user_id = uuid.uuid4()
+
+        events = asyncio.run(collect(agent.stream_message(user_id, "add buy milk", [])))
+
+        assert events[:2] == [
+            {"type": "token", "content": "Adding "},
+            {"type": "token", "content": "it."},
+        ]
+        assert events[2]["type"] == "done"
+        assert events[2]["response"] == "Adding it."
+        assert [r["tool"] for r in events[2]["tool_calls"]] == ["add_task"]
+        agent.mcp_server.add_task.assert_called_once_with(
+            user_id=user_id, description="Buy milk", priority="Medium",
+        )
+        assert agent.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    def test_processed_message_writes_nothing_to_stdout(self, capsys, caplog):
+        """Request details go to the module logger at DEBUG level, never to
+        stdout.
+
+        **Validates: Requirements 5.1**
+        """
+        import asyncio
+        import logging
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+
+        agent = self._agent()
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = AsyncMock(return_value=SimpleNamespace(choices=[
+            SimpleNamespace(
+                finish_reason="stop",
+                message=SimpleNamespace(content="You have no tasks.", tool_calls=None),
+            ),
+        ]))
+
+        with caplog.at_level(logging.DEBUG, logger="app.services.ai_agent"):
+            result = asyncio.run(agent.process_message(uuid.uuid4(), "what's on my list?", []))
+
+        assert result["response"] == "You have no tasks."
+        assert capsys.readouterr().out == ""
+        assert "Response finish_reason: stop" in caplog.text
+
+    @pytest.mark.parametrize("message, is_command", [
+        ("delete task 2", True),
+        ("Add buy milk, high priority!", True),
+        ("mark task 1 as done", True),
+        ("don't delete task 2", True),
+        ("should I delete task 2?", True),
+        ("what do I have to do today?", False),
+        ("list my tasks", False),
+        ("I need to add something but first tell me how priorities work in this app", False),
+    ])
+    def test_short_commands_run_at_low_temperature(self, message, is_command):
+        """Short task commands get a low temperature, but the model is never
+        forced into a tool call and keeps the full reply budget.
+
+        **Validates: Requirements 5.1**
+        """
+        from app.services.ai_agent import COMMAND_TEMPERATURE
+
+        agent = self._agent()
+
+        options = agent._completion_options(message)
+
+        assert options["tool_choice"] == "auto"
+        assert options["max_tokens"] == agent.max_tokens
+        expected_temperature = COMMAND_TEMPERATURE if is_command else agent.temperature
+        assert options["temperature"] == expected_temperature
+
+    def test_concurrent_openai_calls_bounded(self, monkeypatch):
+        """However many messages are processed at once, no more OpenAI calls are in
+        flight than the semaphore allows.
+
+        **Validates: Requirements 5.1**
+        """
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from app.services import ai_agent
+
+        agent = self._agent()
+        in_flight = []
+        peak = []
+
+        async def create(**kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return SimpleNamespace(choices=[SimpleNamespace(
+                finish_reason="stop",
+                message=SimpleNamespace(content="ok", tool_calls=None),
+            )])
+
+        agent.client = MagicMock()
+        agent.client.chat.completions.create = create
+
+        async def scenario():
+            return await asyncio.gather(*(
+                agent.process_message(uuid.uuid4(), "hi", []) for _ in range(5)
+            ))
+
+        semaphore = asyncio.Semaphore(2)
+        monkeypatch.setattr(ai_agent, "get_openai_semaphore", lambda: semaphore)
+        results = asyncio.run(scenario())
+
+        assert [r["response"] for r in results] == ["ok"] * 5
+        assert max(peak) == 2
+
+    @pytest.mark.parametrize("assistant_content, tool_results, expected", [
+        (None, [], "I didn't quite understand that. Could you rephrase your request?"),
+        ("Done.", [{"tool": "list_tasks", "status": "success", "result": []}], "Done."),
+        (
+            None,
+            [
+                {"tool": "add_task", "status": "success", "result": {"description": "Buy milk", "priority": "High"}},
+                {"tool": "delete_task", "status": "success", "result": {}},
+            ],
+            "I've completed the following operations:\n"
+            "✓ Added task: Buy milk (Priority: High)\n"
+            "✓ Task deleted successfully\n",
+        ),
+        (
+            None,
+            [
+                {"tool": "complete_tasks", "status": "success", "result": {"tasks": [
+                    {"description": "Buy milk", "completed": True},
+                    {"description": "Walk dog", "completed": False},
+                ], "not_found": []}},
+                {"tool": "delete_tasks", "status": "success", "result": {"deleted": 3}},
+            ],
+            "I've completed the following operations:\n"
+            "✓ Task marked as completed: Buy milk\n"
+            "✓ Task marked as incomplete: Walk dog\n"
+            "✓ Deleted 3 tasks\n",
+        ),
+        (
+            "Partly done.",
+            [{"tool": "complete_task", "status": "error", "error": "Task not found"}],
+            "Partly done.\n\nI encountered some errors:\n- complete_task: Task not found\n",
+        ),
+        (
+            None,
+            [
+                {"tool": "delete_task", "status": "error", "error": "Task not found"},
+                {"tool": "delete_task", "status": "success", "result": {}},
+                {"tool": "add_task", "status": "error", "error": "Invalid priority"},
+            ],
+            "I encountered some errors:\n"
+            "- delete_task: Task not found\n"
+            "- add_task: Invalid priority\n"
+            "\n\nI've completed the following operations:\n"
+            "✓ Task deleted successfully\n",
+        ),
+    ])
+    def test_final_response_summarizes_tool_results(self, assistant_content, tool_results, expected):
+        """The final response keeps the assistant's text, appends tool errors, and
+        summarizes successful operations only when the assistant said nothing.
+
+        **Validates: Requirements 5.1, 5.2**
+        """
+        from app.services.ai_agent import AIAgent
+
+        agent = AIAgent.__new__(AIAgent)
+
+        assert agent._generate_final_response(assistant_content, tool_results) == expected
+
+    def test_tool_definitions_are_stable_between_servers(self):
+        """Every MCP server offers the same tool definitions, sorted by name, so
+        the tools sent to OpenAI are identical on every request.
+
+        **Validates: Requirements 5.1**
+        """
+        from unittest.mock import MagicMock
+        from app.services.mcp_server import MCPServer
+
+        first = MCPServer(MagicMock(), MagicMock()).get_tool_definitions()
+        second = MCPServer(MagicMock(), MagicMock()).get_tool_definitions()
+
+        names = [tool["name"] for tool in first]
+        assert names == sorted(names)
+        assert set(names) == {
+            "add_task", "complete_task", "complete_tasks", "delete_task", "delete_tasks", "list_tasks", "update_task",
+        }
+        assert first == second
+
+
 class TestErrorResponseGeneration:
     """Property 20: Error Response Generation.
     
@@ -872,6 +1473,67 @@ class TestErrorResponseGeneration:
         assert any(keyword in response.lower() for keyword in guidance_keywords), \
             f"Response should be helpful: {response}"
 
+    @pytest.mark.parametrize("error_message, expected_keyword", [
+        ("Task not found", "not found"),
+        ("PERMISSION denied", "permission"),
+        ("Unauthorized", "unauthorized"),
+        ("Invalid input provided", "invalid"),
+        ("Operation timeout", "timeout"),
+        ("Invalid task: not found", "not found"),
+        ("timeout after invalid retry", "invalid"),
+        ("An unexpected error occurred", None),
+    ])
+    def test_error_response_matches_highest_priority_keyword(self, error_message, expected_keyword):
+        """The ChatService picks the response for the highest-priority keyword in
+        the error, regardless of case or where it appears.
+
+        **Validates: Requirements 5.3**
+        """
+        from app.services.chat import ChatService, ERROR_RESPONSES, GENERIC_ERROR_RESPONSE
+
+        service = ChatService.__new__(ChatService)
+
+        expected = ERROR_RESPONSES[expected_keyword] if expected_keyword else GENERIC_ERROR_RESPONSE
+        assert service._format_error_response(error_message) == expected
+
+    @pytest.mark.parametrize("status_code, expected_attempts", [
+        (429, 4),
+        (503, 4),
+        (400, 1),
+    ])
+    def test_transient_openai_errors_retried(self, monkeypatch, status_code, expected_attempts):
+        """Rate limits and server errors from OpenAI are retried before the user
+        sees an error; bad requests fail straight away.
+
+        **Validates: Requirements 5.3**
+        """
+        import asyncio
+        import httpx
+        from app.services import ai_agent
+
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            return httpx.Response(status_code, headers={"Retry-After": "0.01"}, json={"error": {}})
+
+        class MockedAsyncClient(httpx.AsyncClient):
+            def __init__(self, **kwargs):
+                super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+        monkeypatch.setattr(httpx, "AsyncClient", MockedAsyncClient)
+        ai_agent.get_openai_client.cache_clear()
+        try:
+            with pytest.raises(ai_agent.APIError):
+                asyncio.run(ai_agent.get_openai_client().chat.completions.create(
+                    model="gpt-4o", messages=[{"role": "user", "content": "hi"}],
+                ))
+        finally:
+            ai_agent.get_openai_client.cache_clear()
+
+        assert len(attempts) == expected_attempts
+        assert ai_agent.OPENAI_MAX_RETRIES == 3
+
 
 
 class TestRateLimitingApplication:
@@ -918,6 +1580,378 @@ class TestRateLimitingApplication:
         should_rate_limit = len(recent_requests) > requests_per_minute
         assert should_rate_limit, "Rate limiting should be triggered for excessive requests"
 
+    @given(
+        user_id=st.uuids().map(str),
+        request_count=st.integers(min_value=11, max_value=15),
+    )
+    @settings(max_examples=10)
+    def test_middleware_limits_requests_within_window(self, user_id: str, request_count: int):
+        """For any user exceeding the per-minute budget, RateLimitMiddleware should reject
+        every request past the limit while keeping at most the limit in its history.
+
+        **Validates: Requirements 10.1**
+        """
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10)
+        results = [middleware._check_rate_limit(user_id) for _ in range(request_count)]
+
+        assert results[:10] == [False] * 10, "First 10 requests should be allowed"
+        assert all(results[10:]), "Requests past the limit should be rate limited"
+        assert len(middleware.request_history[user_id]) == 10
+
+    @pytest.mark.parametrize("path", [
+        "/api/tasks",
+        "/api/user-1/chat/history",
+        "/health",
+        "/other/user-1/chat",
+        "/api/user-1/chat/streaming",
+    ])
+    def test_non_chat_paths_bypass_limiter(self, path: str):
+        """Only POST /api/{user_id}/chat (and /chat/stream) is rate limited; other
+        paths pass straight through without touching the request history.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from starlette.requests import Request
+        from starlette.responses import Response
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=1)
+
+        async def call_next(request):
+            return Response("ok")
+
+        request = Request({"type": "http", "method": "GET", "path": path, "headers": []})
+        responses = [asyncio.run(middleware.dispatch(request, call_next)) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert middleware.request_history == {}
+        assert middleware.inflight == {}
+
+    def test_streaming_chat_shares_chat_budget(self):
+        """The streaming chat endpoint counts against the same per-user budget as
+        the regular chat endpoint.
+
+        **Validates: Requirements 10.1, 10.2**
+        """
+        import asyncio
+        from starlette.requests import Request
+        from starlette.responses import Response
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=1)
+
+        async def call_next(request):
+            return Response("ok")
+
+        responses = [
+            asyncio.run(middleware.dispatch(
+                Request({"type": "http", "method": "POST", "path": path, "headers": []}),
+                call_next,
+            ))
+            for path in ["/api/user-1/chat", "/api/user-1/chat/stream"]
+        ]
+
+        assert [r.status_code for r in responses] == [200, 429]
+
+    def test_limiter_window_follows_monotonic_clock(self, monkeypatch):
+        """The window is measured on the monotonic clock: a wall-clock jump does not
+        reset it, and requests are allowed again once the window has elapsed.
+
+        **Validates: Requirements 10.1**
+        """
+        import time
+        from app.middleware import RateLimitMiddleware
+
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(time, "time", lambda: 0.0)
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=2)
+
+        assert middleware._check_rate_limit("user") is False
+        assert middleware._check_rate_limit("user") is False
+        assert middleware._check_rate_limit("user") is True
+
+        clock[0] += middleware.window_seconds
+        assert middleware._check_rate_limit("user") is False
+
+    @given(
+        user_ids=st.lists(st.uuids().map(str), min_size=1, max_size=10, unique=True),
+    )
+    @settings(max_examples=10)
+    def test_sweeper_drops_idle_users(self, user_ids: list):
+        """For any set of users whose last request fell outside the window, the sweeper
+        should remove them so request history stays bounded.
+
+        **Validates: Requirements 10.1**
+        """
+        import time
+        from collections import deque
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10)
+        stale = time.monotonic() - 120.0
+        for user_id in user_ids:
+            middleware.request_history[user_id] = deque([stale])
+        middleware._check_rate_limit("active-user")
+
+        assert middleware._sweep_request_history() == len(user_ids)
+        assert list(middleware.request_history) == ["active-user"]
+
+    def test_sweeper_runs_between_startup_and_shutdown(self):
+        """The sweeper starts with the application, sweeps idle users in the background,
+        and is cancelled on shutdown.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        import time
+        from collections import deque
+        from unittest.mock import AsyncMock
+        from app.middleware import RateLimitMiddleware
+
+        async def scenario():
+            async def app(scope, receive, send):
+                await receive()
+                middleware.request_history["idle-user"] = deque([time.monotonic() - 120.0])
+                await asyncio.sleep(0.05)
+                assert "idle-user" not in middleware.request_history
+                assert not middleware._sweeper.done()
+                await receive()
+
+            messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+
+            async def receive():
+                return next(messages)
+
+            middleware = RateLimitMiddleware(app=app, requests_per_minute=10)
+            middleware.sweep_interval = 0.01
+            await middleware({"type": "lifespan"}, receive, AsyncMock())
+            return middleware
+
+        middleware = asyncio.run(scenario())
+
+        assert middleware._sweeper is None, "Sweeper should be cancelled on shutdown"
+
+    def test_sweeper_restarts_after_previous_loop_finished(self):
+        """A sweeper left over from a closed event loop is replaced on the next startup.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10)
+
+        async def start():
+            middleware.start()
+            return middleware._sweeper
+
+        first = asyncio.run(start())
+        second = asyncio.run(start())
+
+        assert first.done()
+        assert second is not first
+
+
+class TestSharedRateLimiting:
+    """Property 44: Rate Limiting Application across workers (Redis limiter).
+    
+    Validates: Requirements 10.1, 10.2
+    """
+
+    def _redis_middleware(self, script):
+        """Build a middleware whose Redis script is replaced by ``script``."""
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10)
+        middleware.redis = object()
+        middleware.sliding_window = script
+        return middleware
+
+    def test_redis_window_allows_request_under_limit(self):
+        """When the shared window has room, the request is allowed and recorded under
+        the user's key with the configured limit.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        script = AsyncMock(return_value=0)
+        middleware = self._redis_middleware(script)
+
+        assert asyncio.run(middleware._check_rate_limit_redis("user-1")) is False
+        kwargs = script.await_args.kwargs
+        assert kwargs["keys"] == ["rl:user-1"]
+        assert kwargs["args"][1] == 10
+        assert middleware.request_history == {}, "Local history should not be used"
+
+    def test_redis_window_denies_request_over_limit(self):
+        """When the shared window is full, the request is rate limited.
+
+        **Validates: Requirements 10.2**
+        """
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        middleware = self._redis_middleware(AsyncMock(return_value=1))
+
+        assert asyncio.run(middleware._check_rate_limit_redis("user-1")) is True
+
+    def test_redis_outage_falls_back_to_local_limiter(self, caplog):
+        """When Redis is unreachable, requests are limited in-process and the outage
+        is logged once rather than on every request.
+
+        **Validates: Requirements 10.1, 10.2**
+        """
+        import asyncio
+        import logging
+        from unittest.mock import AsyncMock
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        middleware = self._redis_middleware(AsyncMock(side_effect=RedisConnectionError("down")))
+
+        with caplog.at_level(logging.WARNING, logger="app.middleware"):
+            results = [asyncio.run(middleware._check_rate_limit_redis("user-1")) for _ in range(11)]
+
+        assert results == [False] * 10 + [True]
+        assert len(middleware.request_history["user-1"]) == 10
+        assert len([r for r in caplog.records if r.levelno == logging.WARNING]) == 1
+
+    def test_shutdown_closes_redis_client(self):
+        """On application shutdown the middleware closes its Redis connection pool.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from unittest.mock import AsyncMock
+        from app.middleware import RateLimitMiddleware
+
+        async def app(scope, receive, send):
+            await receive()
+
+        middleware = RateLimitMiddleware(app=app, requests_per_minute=10)
+        middleware.redis = AsyncMock()
+
+        async def receive():
+            return {"type": "lifespan.shutdown"}
+
+        asyncio.run(middleware({"type": "lifespan"}, receive, AsyncMock()))
+
+        middleware.redis.aclose.assert_awaited_once()
+
+
+class TestConcurrentChatLimiting:
+    """Property 44: Rate Limiting Application for concurrent chat requests.
+    
+    Validates: Requirements 10.1, 10.2
+    """
+
+    def _chat_request(self, user_id):
+        """Build a bare chat request for ``user_id``."""
+        from starlette.requests import Request
+
+        return Request({"type": "http", "method": "POST", "path": f"/api/{user_id}/chat", "headers": []})
+
+    def test_requests_over_concurrency_cap_rejected(self):
+        """While a user has the maximum number of chat requests in flight, further
+        requests are rejected with 429 without spending the per-minute budget, and
+        slots are released once the requests finish.
+
+        **Validates: Requirements 10.1, 10.2**
+        """
+        import asyncio
+        from starlette.responses import Response
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10, max_concurrent_per_user=2)
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def call_next(request):
+                await release.wait()
+                return Response("ok")
+
+            held = [
+                asyncio.create_task(middleware.dispatch(self._chat_request("user-1"), call_next))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            rejected = await middleware.dispatch(self._chat_request("user-1"), call_next)
+            other_user = asyncio.create_task(middleware.dispatch(self._chat_request("user-2"), call_next))
+            await asyncio.sleep(0)
+            release.set()
+            finished = await asyncio.gather(*held, other_user)
+            return rejected, finished
+
+        rejected, finished = asyncio.run(scenario())
+
+        assert rejected.status_code == 429
+        assert [r.status_code for r in finished] == [200, 200, 200]
+        assert len(middleware.request_history["user-1"]) == 2
+        assert middleware.inflight == {}
+
+    def test_inflight_slot_released_when_handler_fails(self):
+        """A chat request that raises still releases its in-flight slot.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10, max_concurrent_per_user=1)
+
+        async def call_next(request):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(middleware.dispatch(self._chat_request("user-1"), call_next))
+
+        assert middleware.inflight == {}
+
+    def test_streaming_request_holds_slot_until_body_finishes(self):
+        """A streamed chat reply keeps its in-flight slot while the body is still
+        being produced, and releases it once the body is exhausted or abandoned.
+
+        **Validates: Requirements 10.1**
+        """
+        import asyncio
+        from starlette.responses import StreamingResponse
+        from app.middleware import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, requests_per_minute=10, max_concurrent_per_user=1)
+
+        async def call_next(request):
+            async def body():
+                yield b"data: one\n\n"
+                yield b"data: two\n\n"
+
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        async def scenario():
+            streaming = await middleware.dispatch(self._chat_request("user-1"), call_next)
+            held = dict(middleware.inflight)
+            rejected = await middleware.dispatch(self._chat_request("user-1"), call_next)
+            chunks = [chunk async for chunk in streaming.body_iterator]
+            after_exhausted = dict(middleware.inflight)
+
+            abandoned = await middleware.dispatch(self._chat_request("user-1"), call_next)
+            await abandoned.body_iterator.__anext__()
+            await abandoned.body_iterator.aclose()
+            return held, rejected, chunks, after_exhausted
+
+        held, rejected, chunks, after_exhausted = asyncio.run(scenario())
+
+        assert held == {"user-1": 1}
+        assert rejected.status_code == 429
+        assert chunks == [b"data: one\n\n", b"data: two\n\n"]
+        assert after_exhausted == {}
+        assert middleware.inflight == {}
+
 
 class TestRateLimitExceededResponse:
     """Property 45: Rate Limit Exceeded Response.
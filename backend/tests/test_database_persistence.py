@@ -4,7 +4,6 @@ import pytest
 from hypothesis import given, strategies as st, settings, HealthCheck
 from sqlalchemy.orm import Session
 from app.models import User, Task
-from app.database import SessionLocal
 import bcrypt
 from uuid import uuid4
 
@@ -47,9 +46,9 @@ class TestDatabasePersistence:
         
         task_id = task.id
         
-        # Simulate restart by creating new session
+        # Simulate restart by creating new session on the test's connection
         db.close()
-        new_db = SessionLocal()
+        new_db = Session(bind=db.get_bind(), join_transaction_mode="create_savepoint")
         
         try:
             # Retrieve task from new session
@@ -99,3 +98,113 @@ class TestUserPasswordHashing:
         
         # Verify password can be checked
         assert bcrypt.checkpw(password.encode(), retrieved_user.password_hash.encode()), "Password verification failed"
+
+
+class TestSchemaMigrations:
+    """Schema migrations keep indexes in line with the models."""
+
+    def test_migrations_replace_superseded_indexes(self, db: Session):
+        """Indexes dropped from the models are removed and new ones are created."""
+        from sqlalchemy import inspect, text
+        from app.database import engine
+        from migrations import create_missing_indexes, drop_stale_indexes
+
+        # Simulate a database created with the earlier task indexes
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_tasks_user_created_id"))
+            connection.execute(text("CREATE INDEX ix_tasks_created_at ON tasks (created_at)"))
+            connection.execute(text("CREATE INDEX ix_tasks_user_created ON tasks (user_id, created_at)"))
+            connection.execute(text("CREATE INDEX ix_tasks_user_id ON tasks (user_id)"))
+            connection.execute(
+                text("CREATE INDEX ix_conversation_messages_user_id ON conversation_messages (user_id)")
+            )
+
+        create_missing_indexes()
+        drop_stale_indexes()
+
+        names = {index["name"] for index in inspect(engine).get_indexes("tasks")}
+        assert "ix_tasks_user_created_id" in names
+        assert "ix_tasks_created_at" not in names
+        assert "ix_tasks_user_created" not in names
+        assert "ix_tasks_user_id" not in names
+        message_names = {index["name"] for index in inspect(engine).get_indexes("conversation_messages")}
+        assert message_names == {"ix_conversation_messages_user_created_id"}
+
+    def test_task_list_query_needs_no_sort(self, db: Session):
+        """The per-user task list is read in index order, with no sort step."""
+        from sqlalchemy import text
+        from uuid import uuid4
+
+        # The test table is tiny, so steer the planner off whole-table scans
+        db.execute(text("SET enable_seqscan = off"))
+        db.execute(text("SET enable_bitmapscan = off"))
+        plan = "\n".join(row[0] for row in db.execute(
+            text(
+                "EXPLAIN SELECT id, description, completed, priority, created_at FROM tasks "
+                "WHERE user_id = :user_id ORDER BY created_at, id"
+            ),
+            {"user_id": uuid4()},
+        ))
+        db.execute(text("RESET enable_seqscan"))
+        db.execute(text("RESET enable_bitmapscan"))
+
+        assert "ix_tasks_user_created_id" in plan
+        assert "Sort" not in plan
+
+
+class TestChatRepositoryQueries:
+    """Chat repository queries return the expected slices of history."""
+
+    def test_recent_messages_are_newest_in_chronological_order(self, db: Session):
+        """With more than N messages stored, the newest N come back oldest first."""
+        from app.repositories import ChatRepository
+
+        user = User(email="recent@example.com", password_hash="hashed_password")
+        db.add(user)
+        db.commit()
+        repo = ChatRepository(db)
+        for i in range(15):
+            repo.add_message(user.id, f"Message {i}", "user")
+
+        recent = repo.get_recent_messages(user.id, count=10)
+
+        assert [message.content for message in recent] == [f"Message {i}" for i in range(5, 15)]
+
+    def test_add_messages_persists_batch_in_order(self, db: Session):
+        """A batch of messages is stored together and returned with ids and timestamps."""
+        from datetime import datetime, timedelta
+        from app.repositories import ChatRepository
+
+        user = User(email="batch@example.com", password_hash="hashed_password")
+        db.add(user)
+        db.commit()
+        sent_at = datetime.utcnow()
+        repo = ChatRepository(db)
+
+        user_message, assistant_message = repo.add_messages([
+            (user.id, "Hello", "user", sent_at),
+            (user.id, "Hi there", "assistant", sent_at + timedelta(seconds=1)),
+        ])
+
+        assert user_message.id is not None and assistant_message.id is not None
+        assert user_message.created_at == sent_at
+        stored = repo.get_messages(user.id)
+        assert [(m.content, m.sender) for m in stored] == [("Hello", "user"), ("Hi there", "assistant")]
+
+    def test_add_messages_rejects_invalid_sender_without_writing(self, db: Session):
+        """An invalid sender anywhere in the batch stores nothing."""
+        from datetime import datetime
+        from app.repositories import ChatRepository
+
+        user = User(email="invalid-batch@example.com", password_hash="hashed_password")
+        db.add(user)
+        db.commit()
+        repo = ChatRepository(db)
+
+        with pytest.raises(ValueError):
+            repo.add_messages([
+                (user.id, "Hello", "user", datetime.utcnow()),
+                (user.id, "Oops", "system", datetime.utcnow()),
+            ])
+
+        assert repo.get_messages(user.id) == []
@@ -97,9 +97,34 @@ class TestTaskCreationProperties:
         task_service = TaskService(db)
         request = TaskCreate(description=description.strip())
         response = task_service.create_task(user_id, request)
-        
+
         assert response.priority == "Medium"
 
+    def test_bulk_creation_persists_all_or_nothing(self, db: Session):
+        """Bulk task creation stores every task in request order, and stores none
+        when any request is invalid.
+
+        **Validates: Requirements 4.1, 4.4**
+        """
+        auth_service = AuthenticationService(db)
+        user_id = auth_service.signup(SignupRequest(email="bulk@example.com", password="password123")).user_id
+        task_service = TaskService(db)
+
+        created = task_service.create_tasks_bulk(user_id, [
+            TaskCreate(description=" First ", priority="High"),
+            TaskCreate(description="Second"),
+        ])
+
+        assert [(t.description, t.priority) for t in created] == [("First", "High"), ("Second", "Medium")]
+        assert task_service.get_tasks(user_id) == created
+
+        with pytest.raises(ValueError):
+            task_service.create_tasks_bulk(user_id, [
+                TaskCreate(description="Third"),
+                TaskCreate(description="   "),
+            ])
+        assert len(task_service.get_tasks(user_id)) == 2
+
 
 class TestTaskDeletionProperties:
     """Property-based tests for task deletion."""
@@ -572,6 +597,55 @@ class TestTaskCompletionProperties:
         with pytest.raises(ValueError, match="not found"):
             task_service.toggle_completion(user_id2, created_task.id)
 
+    def test_toggle_and_update_write_in_place(self, db: Session):
+        """Toggling and updating return the stored task, leave other users'
+        tasks untouched, and keep a loaded task object in sync.
+
+        **Validates: Requirements 5.1, 9.3**
+        """
+        auth_service = AuthenticationService(db)
+        owner_id = auth_service.signup(SignupRequest(email="owner@example.com", password="password123")).user_id
+        other_id = auth_service.signup(SignupRequest(email="other@example.com", password="password123")).user_id
+        task_service = TaskService(db)
+        created = task_service.create_task(owner_id, TaskCreate(description="Write report"))
+        loaded = db.get(Task, created.id)
+
+        toggled = task_service.toggle_completion(owner_id, created.id)
+        updated = task_service.update_task(owner_id, created.id, TaskUpdate(description=" Send report ", priority="High"))
+        with pytest.raises(ValueError, match="not found"):
+            task_service.update_task(other_id, created.id, TaskUpdate(priority="Low"))
+
+        assert toggled.completed is True
+        assert (updated.description, updated.priority, updated.completed) == ("Send report", "High", True)
+        assert updated.created_at == created.created_at
+        assert task_service.get_task(owner_id, created.id) == updated
+        assert (loaded.completed, loaded.priority) == (True, "High")
+
+    def test_bulk_toggle_and_delete_touch_only_own_tasks(self, db: Session):
+        """Bulk toggling returns the owner's tasks in request order and bulk
+        deletion counts only the owner's tasks; other users' IDs are skipped.
+
+        **Validates: Requirements 9.3, 12.3**
+        """
+        auth_service = AuthenticationService(db)
+        owner_id = auth_service.signup(SignupRequest(email="owner@example.com", password="password123")).user_id
+        other_id = auth_service.signup(SignupRequest(email="other@example.com", password="password123")).user_id
+        task_service = TaskService(db)
+        first, second, third = task_service.create_tasks_bulk(
+            owner_id, [TaskCreate(description=f"Task {i}") for i in range(3)]
+        )
+        foreign = task_service.create_task(other_id, TaskCreate(description="Not yours"))
+
+        toggled = task_service.toggle_completion_bulk(owner_id, [third.id, foreign.id, first.id])
+        deleted = task_service.delete_tasks_bulk(owner_id, [second.id, foreign.id])
+
+        assert [(task.id, task.completed) for task in toggled] == [(third.id, True), (first.id, True)]
+        assert deleted == 1
+        assert [task.id for task in task_service.get_tasks(owner_id)] == [first.id, third.id]
+        assert task_service.get_task(other_id, foreign.id).completed is False
+        assert task_service.toggle_completion_bulk(owner_id, []) == []
+        assert task_service.delete_tasks_bulk(owner_id, []) == 0
+
 
 class TestAuthorizationProperties:
     """Property-based tests for authorization."""